@@ -0,0 +1,256 @@
+"""Benchmark the construction & the set algebra of batches at scale
+
+Every workload is generated from a seed, so two runs on the same machine are
+comparable; save one as a baseline & compare the next ones against it:
+
+    python -m benchmarks.bench --output baseline.json
+    python -m benchmarks.bench --baseline baseline.json --max-slowdown 1.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from timeframe import BatchTimeFrame, TimeFrame
+
+EPOCH = datetime(2021, 1, 1)
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+# `in` is one lookup at a time, so there's no point in doing a million of them
+MAX_LOOKUPS = 100_000
+# the processes `init_workers` builds on, see `--workers`
+WORKERS = os.cpu_count() or 1
+
+
+def _frame(start: float, duration: float) -> TimeFrame:
+    """A timeframe from the given minutes since the epoch"""
+    return TimeFrame(
+        EPOCH + timedelta(minutes=start), EPOCH + timedelta(minutes=start + duration)
+    )
+
+
+def sparse(size: int, rng: random.Random) -> List[TimeFrame]:
+    """Short timeframes with long gaps between them, i.e. nothing to merge"""
+    time_frames, cursor = [], 0.0
+    for _ in range(size):
+        cursor += rng.uniform(30, 120)
+        duration = rng.uniform(1, 20)
+        time_frames.append(_frame(cursor, duration))
+        cursor += duration
+    return time_frames
+
+
+def dense(size: int, rng: random.Random) -> List[TimeFrame]:
+    """Timeframes scattered over a span they mostly cover, some overlapping"""
+    return [_frame(rng.uniform(0, size * 10), rng.uniform(1, 15)) for _ in range(size)]
+
+
+def overlapping(size: int, rng: random.Random) -> List[TimeFrame]:
+    """Long timeframes piled on top of each other, merging into a handful"""
+    return [_frame(rng.uniform(0, size), rng.uniform(60, 600)) for _ in range(size)]
+
+
+def adjacent(size: int, rng: random.Random) -> List[TimeFrame]:
+    """Back to back timeframes, each ending where the next one starts"""
+    time_frames, cursor = [], 0.0
+    for _ in range(size):
+        duration = float(rng.randint(1, 30))
+        time_frames.append(_frame(cursor, duration))
+        cursor += duration + (rng.random() < 0.1) * 5  # the odd break
+    return time_frames
+
+
+WORKLOADS: Dict[str, Callable[[int, random.Random], List[TimeFrame]]] = {
+    "sparse": sparse,
+    "dense": dense,
+    "overlapping": overlapping,
+    "adjacent": adjacent,
+}
+
+
+class Case:
+    """The inputs of one workload at one size, shared by all the operations"""
+
+    def __init__(self, workload: str, size: int, seed: int):
+        rng = random.Random(f"{workload}-{size}-{seed}")
+        generate = WORKLOADS[workload]
+        self.time_frames = generate(size, rng)
+        rng.shuffle(self.time_frames)
+        self.batch = BatchTimeFrame(self.time_frames)
+        # shifted a little, so that it partly overlaps with `batch`
+        shift = timedelta(minutes=rng.uniform(5, 40))
+        self.other = BatchTimeFrame(
+            TimeFrame(tf.start + shift, tf.end + shift) for tf in generate(size, rng)
+        )
+        lookups = min(size, MAX_LOOKUPS)
+        start, end = self.batch.start, self.batch.end
+        self.datetimes = [start + (end - start) * rng.random() for _ in range(lookups)]
+
+
+def _contains(case: Case):
+    batch = case.batch
+    for dt in case.datetimes:
+        dt in batch
+
+
+# the setup is excluded from the timings, the operation gets what it returns
+OPERATIONS = {
+    "init": (lambda case: case.time_frames, BatchTimeFrame),
+    # the same on a process pool, which only pays off with several cores
+    "init_workers": (
+        lambda case: case.time_frames,
+        lambda time_frames: BatchTimeFrame.from_frames(time_frames, workers=WORKERS),
+    ),
+    "add": (lambda case: case, lambda case: case.batch + case.other),
+    "mul": (lambda case: case, lambda case: case.batch * case.other),
+    "sub": (lambda case: case, lambda case: case.batch - case.other),
+    "contains": (lambda case: case, _contains),
+    # a fresh batch every time, as the duration is only summed up once
+    "duration": (
+        lambda case: BatchTimeFrame._from_normalized(case.batch.time_frames),
+        lambda batch: batch.duration,
+    ),
+}
+
+
+def measure(setup: Callable, run: Callable, case: Case, repeat: int) -> Dict:
+    """The best time out of `repeat` runs, and the peak memory of another one"""
+    best = float("inf")
+    for _ in range(repeat):
+        argument = setup(case)
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+
+    # tracing slows everything down, hence a separate run for the memory
+    argument = setup(case)
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_memory": peak}
+
+
+def run(
+    workloads: List[str],
+    operations: List[str],
+    sizes: List[int],
+    seed: int,
+    repeat: int,
+) -> List[Dict]:
+    results = []
+    for workload in workloads:
+        for size in sizes:
+            case = Case(workload, size, seed)
+            for operation in operations:
+                setup, call = OPERATIONS[operation]
+                result = measure(setup, call, case, repeat)
+                items = len(case.datetimes) if operation == "contains" else size
+                result.update(
+                    workload=workload,
+                    operation=operation,
+                    size=size,
+                    throughput=items / result["seconds"] if result["seconds"] else None,
+                )
+                results.append(result)
+                print(_format(result), flush=True)
+    return results
+
+
+def _key(result: Dict):
+    return result["workload"], result["operation"], result["size"]
+
+
+def _format(result: Dict, baseline: Optional[Dict] = None) -> str:
+    line = (
+        f"{result['workload']:<12} {result['operation']:<12} {result['size']:>9}"
+        f" {result['seconds'] * 1000:>11.3f}ms"
+        f" {(result['throughput'] or 0):>14,.0f}/s"
+        f" {result['peak_memory'] / 1024:>12,.1f}KiB"
+    )
+    if baseline is not None:
+        line += (
+            f"  x{result['seconds'] / baseline['seconds']:.2f} time"
+            f"  x{result['peak_memory'] / max(baseline['peak_memory'], 1):.2f} memory"
+        )
+    return line
+
+
+def compare(results: List[Dict], baseline: List[Dict], max_slowdown: float) -> bool:
+    """Print every result next to its baseline, return whether none regressed"""
+    baselines = {_key(result): result for result in baseline}
+    ok = True
+    print("\ncompared to the baseline:")
+    for result in results:
+        previous = baselines.get(_key(result))
+        if previous is None:
+            continue
+        print(_format(result, previous))
+        if result["seconds"] > previous["seconds"] * max_slowdown:
+            ok = False
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    global WORKERS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS))
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with a JSON file of results")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=None,
+        help="exit with an error if anything is slower than the baseline by this",
+    )
+    args = parser.parse_args(argv)
+
+    for name, choices in (("workloads", WORKLOADS), ("operations", OPERATIONS)):
+        unknown = set(getattr(args, name)) - set(choices)
+        if unknown:
+            parser.error(f"unknown {name}: {', '.join(sorted(unknown))}")
+
+    WORKERS = args.workers
+
+    results = run(args.workloads, args.operations, args.sizes, args.seed, args.repeat)
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "workers": args.workers,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        ok = compare(results, baseline, args.max_slowdown or float("inf"))
+        if not ok:
+            print(f"\nslower than the baseline by more than x{args.max_slowdown}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
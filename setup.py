@@ -39,4 +39,5 @@ setuptools.setup(
         "Programming Language :: Python :: 3.14",
     ],
     python_requires=">=3.8, <4",
+    extras_require={"numpy": ["numpy"]},
 )
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from timeframe import AsyncCoverageAggregator, BatchTimeFrame, TimeFrame, aio
+
+
+async def stream(time_frames, delay: float = 0):
+    for tf in time_frames:
+        await asyncio.sleep(delay)
+        yield tf
+
+
+def hourly(hours):
+    return [
+        TimeFrame(
+            datetime(2021, 1, 17) + timedelta(hours=hour),
+            datetime(2021, 1, 17) + timedelta(hours=hour, minutes=90),
+        )
+        for hour in hours
+    ]
+
+
+# ======================= Async ============================
+@pytest.mark.asyncio
+async def test_from_async_iter():
+    time_frames = hourly([5, 0, 12, 3, 1, 20, 21])
+
+    btf = await BatchTimeFrame.from_async_iter(stream(time_frames))
+
+    assert btf == BatchTimeFrame(time_frames)
+
+
+@pytest.mark.asyncio
+async def test_from_async_iter_with_an_empty_stream():
+    btf = await BatchTimeFrame.from_async_iter(stream([]))
+
+    assert btf.len_timeframes == 0
+
+
+@pytest.mark.asyncio
+async def test_aggregator_merges_several_sources():
+    aggregator = AsyncCoverageAggregator(flush_size=2)
+    time_frames1 = hourly(range(0, 48, 4))
+    time_frames2 = hourly(range(47, 0, -3))
+
+    await aggregator.consume_all(stream(time_frames1), stream(time_frames2))
+
+    assert aggregator.snapshot() == BatchTimeFrame(time_frames1 + time_frames2)
+
+
+@pytest.mark.asyncio
+async def test_aggregator_snapshots_while_consuming():
+    aggregator = AsyncCoverageAggregator(flush_size=3)
+    time_frames = hourly(range(0, 40, 2))
+    consuming = asyncio.ensure_future(
+        aggregator.consume(stream(time_frames, delay=0.001))
+    )
+
+    await asyncio.sleep(0.005)
+    snapshot = aggregator.snapshot()
+    await consuming
+
+    # whatever came first, left untouched by whatever came next
+    assert (
+        snapshot.time_frames
+        == BatchTimeFrame(time_frames[: len(snapshot.time_frames)]).time_frames
+    )
+    assert aggregator.snapshot() == BatchTimeFrame(time_frames)
+
+
+@pytest.mark.asyncio
+async def test_merge_yields_while_coalescing(monkeypatch):
+    monkeypatch.setattr(aio, "YIELD_EVERY", 10)
+    session = TimeFrame(datetime(2021, 1, 17), datetime(2021, 1, 18))
+    short = [
+        TimeFrame(
+            datetime(2021, 1, 17) + timedelta(minutes=minute),
+            datetime(2021, 1, 17) + timedelta(minutes=minute, seconds=30),
+        )
+        for minute in range(100)
+    ]
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticking = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    before = ticks
+    # the session swallows everything, so the output never grows
+    assert await aio._merge([session], short) == [session]
+    ticking.cancel()
+
+    assert ticks - before >= 10
+
+
+def test_aggregator_rejects_wrong_input():
+    aggregator = AsyncCoverageAggregator()
+    with pytest.raises(TypeError):
+        aggregator.add(BatchTimeFrame([]))
+    with pytest.raises(ValueError):
+        AsyncCoverageAggregator(flush_size=0)
+    with pytest.raises(TypeError):
+        asyncio.run(aggregator.consume([]))
+
+
+def test_aggregator_never_mixes_naive_and_aware():
+    aggregator = AsyncCoverageAggregator()
+    aggregator.add(TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11)))
+
+    with pytest.raises(TypeError):
+        aggregator.add(
+            TimeFrame(
+                datetime(2021, 1, 17, 12, tzinfo=timezone.utc),
+                datetime(2021, 1, 17, 13, tzinfo=timezone.utc),
+            )
+        )
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from timeframe import BatchTimeFrame, TimeFrame, archive
+
+
+@pytest.fixture
+def batch():
+    return BatchTimeFrame(
+        TimeFrame(datetime(2021, 1, 17, hour), datetime(2021, 1, 17, hour, 30, 0, 250))
+        for hour in range(0, 24, 2)
+    )
+
+
+# ======================= Archive ============================
+def test_dump_and_load(batch, tmp_path):
+    path = tmp_path / "batch.tfa"
+    archive.dump(batch, path, chunk_size=5)
+
+    assert archive.load(path) == batch
+    assert list(archive.iter_load(path)) == batch.time_frames
+
+
+def test_dump_replaces_the_archive_atomically(tmp_path):
+    # large enough for the reader not to have it all buffered already
+    batch = BatchTimeFrame(
+        TimeFrame(
+            datetime(2021, 1, 17) + timedelta(seconds=3 * second),
+            datetime(2021, 1, 17) + timedelta(seconds=3 * second + 1),
+        )
+        for second in range(20_000)
+    )
+    path = tmp_path / "batch.tfa"
+    archive.dump(batch, path, chunk_size=100)
+    reading = archive.iter_load(path)
+    first = next(reading)
+
+    archive.dump(BatchTimeFrame([]), path)
+
+    # the reader still has the previous archive open, in one piece
+    assert [first, *reading] == batch.time_frames
+    assert archive.load(path).len_timeframes == 0
+    assert [entry.name for entry in tmp_path.iterdir()] == ["batch.tfa"]
+
+
+def test_dump_is_compact(tmp_path):
+    batch = BatchTimeFrame(
+        TimeFrame(
+            datetime(2021, 1, 17) + timedelta(seconds=2 * second),
+            datetime(2021, 1, 17) + timedelta(seconds=2 * second + 1),
+        )
+        for second in range(1000)
+    )
+    path = tmp_path / "batch.tfa"
+    archive.dump(batch, path)
+
+    # a start & an end take 16 bytes uncompressed, 6 as varints here
+    assert path.stat().st_size < 7 * batch.len_timeframes
+
+
+def test_iter_load_from_a_given_start(batch, tmp_path):
+    path = tmp_path / "batch.tfa"
+    archive.dump(batch, path, chunk_size=5)
+
+    # in the middle of a timeframe, which is where decoding begins
+    time_frames = list(archive.iter_load(path, start=datetime(2021, 1, 17, 14, 10)))
+    assert time_frames == [tf for tf in batch if tf.end >= datetime(2021, 1, 17, 14)]
+
+    # in between two of them
+    time_frames = list(archive.iter_load(path, start=datetime(2021, 1, 17, 15)))
+    assert time_frames[0].start == datetime(2021, 1, 17, 16)
+
+    assert list(archive.iter_load(path, start=datetime(2021, 1, 18))) == []
+    assert list(archive.iter_load(path, start=datetime(2021, 1, 16))) == list(batch)
+
+
+def test_dump_keeps_the_utc_offset(tmp_path):
+    tz = timezone(timedelta(hours=-5))
+    tf = TimeFrame(
+        datetime(2021, 1, 17, 10, tzinfo=tz), datetime(2021, 1, 17, 12, tzinfo=tz)
+    )
+    path = tmp_path / "batch.tfa"
+    archive.dump(BatchTimeFrame([tf]), path)
+
+    (loaded,) = archive.iter_load(path)
+    assert loaded == tf
+    assert loaded.start.utcoffset() == timedelta(hours=-5)
+
+
+def test_dump_and_load_an_empty_batch(tmp_path):
+    path = tmp_path / "batch.tfa"
+    archive.dump(BatchTimeFrame([]), path)
+
+    assert archive.load(path).len_timeframes == 0
+
+
+def test_archive_rejects_wrong_input(batch, tmp_path):
+    path = tmp_path / "batch.tfa"
+    with pytest.raises(TypeError):
+        archive.dump([], path)
+    with pytest.raises(ValueError):
+        archive.dump(batch, path, chunk_size=0)
+
+    path.write_bytes(b"not an archive at all, not even close to one")
+    with pytest.raises(ValueError):
+        archive.load(path)
+
+
+def test_iter_load_never_mixes_naive_and_aware(batch, tmp_path):
+    path = tmp_path / "batch.tfa"
+    archive.dump(batch, path)
+
+    with pytest.raises(TypeError):
+        list(archive.iter_load(path, start=datetime(2021, 1, 17, tzinfo=timezone.utc)))
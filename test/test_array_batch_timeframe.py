@@ -0,0 +1,234 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from timeframe import ArrayBatchTimeFrame, BatchTimeFrame, TimeFrame
+
+np = pytest.importorskip("numpy")
+
+
+# ======================= Initialization ============================
+def test_array_batch_timeframe_initialize_successfully():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 12))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+
+    abtf = ArrayBatchTimeFrame([tf3, tf2, tf1])
+
+    assert abtf.len_timeframes == 2
+    assert abtf.time_frames == [TimeFrame(tf1.start, tf2.end), tf3]
+    assert abtf.duration == (tf1 + tf2).duration + tf3.duration
+    assert abtf.start == tf1.start
+    assert abtf.end == tf3.end
+
+
+def test_array_batch_timeframe_raises_type_error():
+    with pytest.raises(TypeError):
+        ArrayBatchTimeFrame(1)
+
+    with pytest.raises(TypeError):
+        ArrayBatchTimeFrame([datetime(2021, 1, 17)])
+
+
+def test_array_batch_timeframe_from_arrays():
+    starts = np.array(["2021-01-17T10", "2021-01-17T12"], dtype="datetime64[us]")
+    ends = np.array(["2021-01-17T11", "2021-01-17T14"], dtype="datetime64[us]")
+
+    abtf = ArrayBatchTimeFrame.from_arrays(starts, ends)
+
+    assert abtf.time_frames == [
+        TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11)),
+        TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14)),
+    ]
+    assert abtf == ArrayBatchTimeFrame.from_arrays(abtf.starts_us, abtf.ends_us)
+
+    with pytest.raises(ValueError):
+        ArrayBatchTimeFrame.from_arrays(ends, starts)
+
+
+def test_array_batch_timeframe_keeps_the_timezone():
+    tehran = timezone(timedelta(hours=3, minutes=30))
+    tf = TimeFrame(
+        datetime(2021, 1, 17, 10, tzinfo=tehran),
+        datetime(2021, 1, 17, 11, tzinfo=tehran),
+    )
+
+    (assertion,) = ArrayBatchTimeFrame([tf])
+
+    assert assertion == tf
+    assert assertion.start.tzinfo == tehran
+
+
+def test_array_batch_timeframe_never_mixes_naive_and_aware():
+    naive = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    aware = TimeFrame(
+        datetime(2021, 1, 17, 12, tzinfo=timezone.utc),
+        datetime(2021, 1, 17, 13, tzinfo=timezone.utc),
+    )
+
+    with pytest.raises(TypeError):
+        ArrayBatchTimeFrame([naive, aware])
+    with pytest.raises(TypeError):
+        ArrayBatchTimeFrame([naive]) + aware
+
+
+def test_batch_timeframe_from_frames_picks_the_backend():
+    tf = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+
+    assert isinstance(BatchTimeFrame.from_frames([tf]), BatchTimeFrame)
+    assert isinstance(
+        BatchTimeFrame.from_frames([tf], backend="numpy"), ArrayBatchTimeFrame
+    )
+    assert isinstance(
+        BatchTimeFrame.from_frames([tf], backend="auto"), ArrayBatchTimeFrame
+    )
+
+    with pytest.raises(ValueError):
+        BatchTimeFrame.from_frames([tf], backend="fortran")
+
+
+# ======================= Operations ============================
+def test_array_batch_timeframe_gives_the_same_results_as_batch_timeframe():
+    start = datetime(2021, 1, 17)
+    minutes = [(0, 30), (20, 50), (60, 61), (90, 120), (125, 200), (240, 240)]
+    other_minutes = [(10, 25), (50, 60), (61, 90), (130, 131), (150, 260)]
+    time_frames = [
+        TimeFrame(start + timedelta(minutes=a), start + timedelta(minutes=b))
+        for a, b in minutes
+    ]
+    other_time_frames = [
+        TimeFrame(start + timedelta(minutes=a), start + timedelta(minutes=b))
+        for a, b in other_minutes
+    ]
+    btf1, btf2 = BatchTimeFrame(time_frames), BatchTimeFrame(other_time_frames)
+    abtf1, abtf2 = (
+        ArrayBatchTimeFrame(time_frames),
+        ArrayBatchTimeFrame(other_time_frames),
+    )
+
+    assert (abtf1 + abtf2).time_frames == (btf1 + btf2).time_frames
+    assert (abtf1 * abtf2).time_frames == (btf1 * btf2).time_frames
+    assert (abtf1 - abtf2).time_frames == (btf1 - btf2).time_frames
+    assert (abtf2 - abtf1).time_frames == (btf2 - btf1).time_frames
+    assert (abtf1 - abtf2).duration_us == (btf1 - btf2).duration_us
+
+
+def test_array_batch_timeframe_subtracts_candidates_touching_on_the_edge():
+    start = datetime(2021, 1, 17)
+    us = [(0, 10), (20, 30), (40, 40)]
+    other_us = [(-5, 0), (12, 14), (15, 15), (16, 16), (30, 35), (40, 40)]
+    time_frames = [
+        TimeFrame(start + timedelta(microseconds=a), start + timedelta(microseconds=b))
+        for a, b in us
+    ]
+    other_time_frames = [
+        TimeFrame(start + timedelta(microseconds=a), start + timedelta(microseconds=b))
+        for a, b in other_us
+    ]
+
+    btf = BatchTimeFrame(time_frames) - BatchTimeFrame(other_time_frames)
+    abtf = ArrayBatchTimeFrame(time_frames) - ArrayBatchTimeFrame(other_time_frames)
+
+    assert abtf.time_frames == btf.time_frames
+
+
+def test_array_batch_timeframe_interoperates_with_the_other_timeframes():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 15))
+    abtf = ArrayBatchTimeFrame([tf1, tf2])
+    btf = BatchTimeFrame([tf1, tf2])
+
+    assert isinstance(btf + abtf, ArrayBatchTimeFrame)
+    assert (tf3 + abtf).time_frames == (tf3 + btf).time_frames
+    assert (tf3 * abtf).time_frames == (tf3 * btf).time_frames
+    assert (tf3 - abtf) == tf3 - btf
+    assert (btf - abtf).len_timeframes == 0
+    assert abtf == btf
+    assert btf == abtf
+
+
+def test_array_batch_timeframe_gaps():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+    abtf = ArrayBatchTimeFrame([tf1, tf2, tf3])
+    btf = BatchTimeFrame([tf1, tf2, tf3])
+    within = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 19))
+
+    assert abtf.gaps(within).time_frames == btf.gaps(within).time_frames
+    assert abtf.gaps().time_frames == btf.gaps().time_frames
+    assert abtf.complement(within) == btf.complement(within)
+
+
+def test_array_batch_timeframe_histogram():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 12, 15))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 14), datetime(2021, 1, 17, 14, 20))
+    abtf = ArrayBatchTimeFrame([tf1, tf2])
+    btf = BatchTimeFrame([tf1, tf2])
+    start, end = datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 16)
+
+    histogram = abtf.histogram(timedelta(hours=1), start, end)
+    assert isinstance(histogram, np.ndarray)
+    assert histogram.tolist() == btf.histogram(timedelta(hours=1), start, end)
+    assert abtf.histogram(timedelta(hours=1)).tolist() == btf.histogram(
+        timedelta(hours=1)
+    )
+    assert len(ArrayBatchTimeFrame([]).histogram(timedelta(hours=1), start, end)) == 7
+
+
+# ======================= Inclusion ============================
+def test_array_batch_timeframe_contains():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 15))
+    abtf = ArrayBatchTimeFrame([tf1, tf2])
+
+    assert datetime(2021, 1, 17, 11) in abtf
+    assert datetime(2021, 1, 17, 11, 30) not in abtf
+    assert tf2 in abtf
+    assert tf3 not in abtf
+    assert BatchTimeFrame([tf1, tf2]) in abtf
+    assert abtf in BatchTimeFrame([tf1, tf2])
+    assert abtf not in tf1
+    assert ArrayBatchTimeFrame([]) in abtf
+
+
+def test_batch_timeframe_locate_many_of_an_array_across_chunks():
+    base = datetime(2021, 1, 17)
+    btf = BatchTimeFrame(
+        TimeFrame(
+            base + timedelta(hours=hour), base + timedelta(hours=hour, minutes=30)
+        )
+        for hour in range(2500)
+    )
+    dts = [base + timedelta(hours=hour, minutes=15) for hour in range(2499, -1, -7)]
+    dts += [base + timedelta(hours=hour, minutes=45) for hour in range(0, 2500, 11)]
+    dts += [base - timedelta(hours=1), base + timedelta(hours=2500)]
+
+    located = btf.locate_many(np.array(dts, dtype="datetime64[us]"))
+
+    assert located.tolist() == btf.locate_many(dts)
+
+
+def test_array_batch_timeframe_locate_many_and_contains_many():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    dts = np.array(
+        [
+            "2021-01-17T13",
+            "2021-01-17T09",
+            "2021-01-17T11",
+            "2021-01-17T11:30",
+            "2021-01-17T14",
+        ],
+        dtype="datetime64[us]",
+    )
+
+    for btf in (ArrayBatchTimeFrame([tf1, tf2]), BatchTimeFrame([tf1, tf2])):
+        assert btf.locate_many(dts).tolist() == [1, -1, 0, -1, 1]
+        assert btf.contains_many(dts).tolist() == [True, False, True, False, True]
+
+    abtf = ArrayBatchTimeFrame([tf1, tf2])
+    assert abtf.locate_many([datetime(2021, 1, 17, 10)]).tolist() == [0]
+    assert ArrayBatchTimeFrame([]).contains_many(dts).tolist() == [False] * 5
@@ -1,9 +1,17 @@
-from datetime import datetime, timedelta
+import random
+from datetime import datetime, timedelta, timezone
 from functools import reduce
+from itertools import count, islice
 
 import pytest
 
-from timeframe import BatchTimeFrame, TimeFrame
+from timeframe import (
+    BatchTimeFrame,
+    TimeFrame,
+    iter_intersection,
+    iter_union,
+    normalize,
+)
 
 
 # ======================= Initialization ============================
@@ -89,6 +97,102 @@ def test_batch_timeframe_initialize_with_overlapped_elements_prunes_extras():
     assert btf.len_timeframes == expected_len
 
 
+def test_batch_timeframe_initialize_with_long_overlapping_chain_merges_all():
+    start = datetime(2021, 1, 17)
+    tf_list = [
+        TimeFrame(start + timedelta(seconds=i), start + timedelta(seconds=i + 2))
+        for i in range(5000)
+    ]
+
+    btf = BatchTimeFrame(tf_list[::-1])
+
+    assert btf.len_timeframes == 1
+    assert list(btf) == [TimeFrame(start, start + timedelta(seconds=5001))]
+
+
+def test_batch_timeframe_initialize_keeps_timeframes_sorted():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 10, 30))
+    tf4 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 12))
+
+    btf = BatchTimeFrame([tf1, tf2, tf3, tf4])
+
+    assert list(btf) == [tf2, tf4, tf1]
+
+
+def test_batch_timeframe_bounds_are_the_earliest_start_and_latest_end():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+
+    btf = BatchTimeFrame([tf1, tf2])
+
+    assert btf.start == tf2.start
+    assert btf.end == tf1.end
+    assert BatchTimeFrame([]).start is None
+    assert BatchTimeFrame([]).end is None
+
+
+def test_batch_timeframe_duration_is_kept_up_to_date_on_mutation():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 12, 30))
+
+    btf = BatchTimeFrame([tf1, tf2])
+    assert btf.duration == tf1.duration + tf2.duration
+
+    btf += tf3
+    assert btf.duration == TimeFrame(tf1.start, tf2.end).duration
+
+    btf -= tf1
+    assert btf.duration == sum(tf.duration for tf in btf)
+    assert btf.start == tf1.end + timedelta(microseconds=1)
+
+
+def test_batch_timeframe_duration_us_is_an_exact_sum():
+    start = datetime(2021, 1, 17)
+    tf_list = [
+        TimeFrame(
+            start + timedelta(seconds=3 * i),
+            start + timedelta(seconds=3 * i, microseconds=100_001),
+        )
+        for i in range(10_000)
+    ]
+
+    btf = BatchTimeFrame(tf_list)
+
+    assert btf.duration_us == 10_000 * 100_001
+    assert btf.duration == btf.duration_us / 1_000_000
+    assert (btf - tf_list[0]).duration_us == 9_999 * 100_001
+
+
+def test_batch_timeframe_initialize_with_a_generator():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+
+    btf = BatchTimeFrame(tf for tf in [tf2, tf1])
+
+    assert btf.time_frames == [tf1, tf2]
+
+
+def test_batch_timeframe_from_iterable_collects_in_one_pass():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 12))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+    tf4 = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 10))
+
+    assert BatchTimeFrame.from_iterable(iter([tf1, tf2, tf3])) == BatchTimeFrame(
+        [tf1, tf2, tf3]
+    )
+    assert BatchTimeFrame.from_iterable(iter([tf3, tf1, tf4, tf2])) == BatchTimeFrame(
+        [tf1, tf2, tf3, tf4]
+    )
+    assert BatchTimeFrame.from_iterable(iter([])).len_timeframes == 0
+
+    with pytest.raises(TypeError):
+        BatchTimeFrame.from_iterable(iter([tf1, BatchTimeFrame([tf2])]))
+
+
 # ======================= Inclusion ============================
 def test_batch_timeframe_includes_another_batch_timeframe_with_overlap():
     tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
@@ -207,6 +311,37 @@ def test_batch_timeframe_inclusion_check_with_in_keyword(faker, empty_timeframe)
     assert empty_timeframe in BatchTimeFrame([tf1])
 
 
+def test_batch_timeframe_inclusion_check_on_boundaries_of_many_timeframes():
+    start = datetime(2021, 1, 17)
+    btf = BatchTimeFrame(
+        [
+            TimeFrame(
+                start + timedelta(hours=i), start + timedelta(hours=i, minutes=30)
+            )
+            for i in range(1000)
+        ]
+    )
+
+    assert start in btf
+    assert start - timedelta(microseconds=1) not in btf
+    assert start + timedelta(hours=500, minutes=30) in btf
+    assert start + timedelta(hours=500, minutes=31) not in btf
+    assert start + timedelta(hours=1000) not in btf
+    assert (
+        TimeFrame(start + timedelta(hours=7), start + timedelta(hours=7, minutes=30))
+        in btf
+    )
+    assert TimeFrame(start + timedelta(hours=7), start + timedelta(hours=8)) not in btf
+    assert btf.includes(
+        TimeFrame(
+            start + timedelta(hours=9, minutes=1), start + timedelta(hours=9, minutes=2)
+        )
+    )
+    assert not btf.includes(
+        TimeFrame(start + timedelta(hours=9), start + timedelta(hours=9, minutes=2))
+    )
+
+
 def test_batch_timeframe_inclusion_check_with_other_types_raise_value_error(faker):
     dt1 = faker.date_time_between(start_date="-1y", end_date="-6M")
     dt2 = faker.date_time_between(start_date=dt1, end_date="now")
@@ -239,6 +374,126 @@ def test_batch_timeframe_inclusion_check_with_include_warns_deprecation(
         random_batch_timeframes.includes(random_timeframe)
 
 
+def test_batch_timeframe_locate_many_and_contains_many():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    btf = BatchTimeFrame([tf2, tf1])
+    dts = [
+        datetime(2021, 1, 17, 13),
+        datetime(2021, 1, 17, 9),
+        datetime(2021, 1, 17, 11),
+        datetime(2021, 1, 17, 11, 30),
+        datetime(2021, 1, 17, 14),
+        datetime(2021, 1, 17, 15),
+    ]
+
+    assert btf.locate_many(dts) == [1, -1, 0, -1, 1, -1]
+    assert btf.contains_many(dts) == [dt in btf for dt in dts]
+    assert BatchTimeFrame([]).locate_many(dts) == [-1] * len(dts)
+
+    with pytest.raises(TypeError):
+        btf.locate_many([datetime(2021, 1, 17, 13), 1])
+
+
+def test_batch_timeframe_locate_many_across_chunks():
+    base = datetime(2021, 1, 17)
+    btf = BatchTimeFrame(
+        TimeFrame(
+            base + timedelta(hours=hour), base + timedelta(hours=hour, minutes=30)
+        )
+        for hour in range(2500)
+    )
+    dts = [base + timedelta(hours=hour, minutes=15) for hour in range(2499, -1, -7)]
+    dts += [base + timedelta(hours=hour, minutes=45) for hour in range(0, 2500, 11)]
+    dts += [base - timedelta(hours=1), base + timedelta(hours=2500)]
+
+    assert btf.locate_many(dts) == [
+        int((dt - base) / timedelta(hours=1)) if dt.minute == 15 else -1 for dt in dts
+    ]
+
+
+def test_batch_timeframe_naive_and_aware_are_never_compared():
+    naive = BatchTimeFrame(
+        [TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))]
+    )
+    aware = BatchTimeFrame(
+        [
+            TimeFrame(
+                datetime(2021, 1, 17, 10, tzinfo=timezone.utc),
+                datetime(2021, 1, 17, 11, tzinfo=timezone.utc),
+            )
+        ]
+    )
+
+    with pytest.raises(TypeError):
+        datetime(2021, 1, 17, 10, 30) in aware
+    with pytest.raises(TypeError):
+        datetime(2021, 1, 17, 10, 30, tzinfo=timezone.utc) in naive
+    with pytest.raises(TypeError):
+        naive in aware
+    with pytest.raises(TypeError):
+        aware.locate_many([datetime(2021, 1, 17, 10, 30)])
+    with pytest.raises(TypeError):
+        BatchTimeFrame(naive.time_frames + aware.time_frames)
+    # an empty batch goes along with either of them
+    assert BatchTimeFrame([]) in naive
+    assert BatchTimeFrame([]) in aware
+
+
+def _naive_and_aware():
+    naive = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    aware = TimeFrame(
+        datetime(2021, 1, 17, 10, 30, tzinfo=timezone.utc),
+        datetime(2021, 1, 17, 12, tzinfo=timezone.utc),
+    )
+    return naive, aware
+
+
+def test_batch_timeframe_arithmetic_never_mixes_naive_and_aware():
+    naive, aware = _naive_and_aware()
+
+    with pytest.raises(TypeError):
+        BatchTimeFrame([naive]) + aware
+    with pytest.raises(TypeError):
+        BatchTimeFrame([naive]).add(aware)
+    with pytest.raises(TypeError):
+        BatchTimeFrame([naive]) * aware
+    with pytest.raises(TypeError):
+        BatchTimeFrame([naive]) - BatchTimeFrame([aware])
+    with pytest.raises(TypeError):
+        naive + aware
+    with pytest.raises(TypeError):
+        naive * aware
+    with pytest.raises(TypeError):
+        naive - aware
+
+
+def test_batch_timeframe_queries_never_mix_naive_and_aware():
+    naive, aware = _naive_and_aware()
+
+    with pytest.raises(TypeError):
+        BatchTimeFrame([naive]).includes(aware)
+    with pytest.raises(TypeError):
+        BatchTimeFrame([naive]).gaps(within=aware)
+
+
+def test_batch_timeframe_constructors_never_mix_naive_and_aware():
+    naive, aware = _naive_and_aware()
+
+    with pytest.raises(TypeError):
+        BatchTimeFrame.from_iterable([naive, aware])
+    with pytest.raises(TypeError):
+        list(normalize([naive, aware]))
+    with pytest.raises(TypeError):
+        list(iter_union([[naive], [aware]]))
+    with pytest.raises(TypeError):
+        BatchTimeFrame.union_all([[naive], [aware]])
+    with pytest.raises(TypeError):
+        list(iter_intersection([[naive], [aware]]))
+    with pytest.raises(TypeError):
+        BatchTimeFrame.intersect_all([[naive], [aware]])
+
+
 # ======================= Summation ============================
 def test_batch_timeframe_add_two_instances_successfully():
     tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 11))
@@ -303,6 +558,48 @@ def test_batch_timeframe_add_empty_timeframe_results_in_the_same_object():
     assert btf2.duration == btf1.duration
 
 
+def test_batch_timeframe_add_in_place_keeps_the_same_instance():
+    tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 18, 12), datetime(2021, 1, 18, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 18, 10, 30), datetime(2021, 1, 18, 12))
+
+    btf = BatchTimeFrame([tf1, tf2])
+    alias = btf
+
+    btf += tf3
+
+    assert alias is btf
+    assert btf == BatchTimeFrame([TimeFrame(tf1.start, tf2.end)])
+
+    btf -= tf3
+
+    assert alias is btf
+    assert btf == BatchTimeFrame([TimeFrame(tf1.start, tf2.end)]) - tf3
+
+
+def test_batch_timeframe_add_and_discard_across_many_timeframes():
+    start = datetime(2021, 1, 18)
+    tf_list = [
+        TimeFrame(start + timedelta(hours=i), start + timedelta(hours=i, minutes=30))
+        for i in range(5000)
+    ]
+    bridge = TimeFrame(start + timedelta(hours=999), start + timedelta(hours=2001))
+
+    btf = BatchTimeFrame(tf_list)
+    btf.add(bridge)
+
+    assert btf.len_timeframes == 5000 - 1003 + 1
+    assert btf == BatchTimeFrame(tf_list + [bridge])
+    assert start + timedelta(hours=1500, minutes=45) in btf
+
+    btf.discard(bridge)
+
+    assert btf.len_timeframes == 5000 - 1003 + 1
+    assert btf == BatchTimeFrame(tf_list + [bridge]) - bridge
+    assert start + timedelta(hours=1500, minutes=15) not in btf
+    assert start + timedelta(hours=2001, minutes=15) in btf
+
+
 def test_batch_timeframe_add_with_non_base_timeframe_raises_type_error():
     tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
     tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
@@ -351,6 +648,25 @@ def test_batch_timeframe_muliply_two_instances_successfully():
     assert btf3.duration == (tf1 + tf2 + tf3).duration
 
 
+def test_batch_timeframe_multiply_interleaved_instances_gives_pairwise_overlaps():
+    tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 18, 12), datetime(2021, 1, 18, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 18, 18), datetime(2021, 1, 18, 20))
+    tf4 = TimeFrame(datetime(2021, 1, 18, 10, 30), datetime(2021, 1, 18, 13))
+    tf5 = TimeFrame(datetime(2021, 1, 18, 13, 30), datetime(2021, 1, 18, 19))
+
+    btf1 = BatchTimeFrame([tf1, tf2, tf3])
+    btf2 = BatchTimeFrame([tf4, tf5])
+
+    expected = BatchTimeFrame(
+        [tf1 * tf4, tf2 * tf4, tf2 * tf5, tf3 * tf5],
+    )
+
+    assert btf1 * btf2 == expected
+    assert btf2 * btf1 == expected
+    assert (btf1 * btf2).len_timeframes == 4
+
+
 def test_batch_timeframe_multiply_with_timeframe_successfully():
     tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 11))
     tf2 = TimeFrame(datetime(2021, 1, 18, 12), datetime(2021, 1, 18, 14))
@@ -445,6 +761,32 @@ def test_batch_timeframe_subtract_two_instances_successfully():
     assert btf2.duration == btf1.duration
 
 
+def test_batch_timeframe_subtract_splitting_the_same_timeframe_many_times():
+    tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 14))
+    tf2 = TimeFrame(datetime(2021, 1, 18, 18), datetime(2021, 1, 18, 20))
+    tf3 = TimeFrame(datetime(2021, 1, 18, 11), datetime(2021, 1, 18, 11, 30))
+    tf4 = TimeFrame(datetime(2021, 1, 18, 12), datetime(2021, 1, 18, 12, 30))
+    tf5 = TimeFrame(datetime(2021, 1, 18, 13, 30), datetime(2021, 1, 18, 19))
+
+    btf = BatchTimeFrame([tf1, tf2]) - BatchTimeFrame([tf3, tf4, tf5])
+
+    assert btf == BatchTimeFrame(
+        [
+            TimeFrame(tf1.start, tf3.start - timedelta(microseconds=1)),
+            TimeFrame(
+                tf3.end + timedelta(microseconds=1),
+                tf4.start - timedelta(microseconds=1),
+            ),
+            TimeFrame(
+                tf4.end + timedelta(microseconds=1),
+                tf5.start - timedelta(microseconds=1),
+            ),
+            TimeFrame(tf5.end + timedelta(microseconds=1), tf2.end),
+        ]
+    )
+    assert tf1 - BatchTimeFrame([tf3, tf4, tf5]) == BatchTimeFrame(list(btf)[:3])
+
+
 def test_batch_timeframe_subtract_with_timeframe_successfully():
     tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 11))
     tf2 = TimeFrame(datetime(2021, 1, 18, 12), datetime(2021, 1, 18, 14))
@@ -517,6 +859,282 @@ def test_batch_timeframe_subtract_from_non_base_timeframe_raises_type_error():
         btf - [1, 1.0, "dummy", True]
 
 
+def test_batch_timeframe_gaps_within_bounds():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+    btf = BatchTimeFrame([tf1, tf2, tf3])
+    within = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 19))
+
+    gaps = btf.gaps(within)
+
+    assert gaps.time_frames == [
+        TimeFrame(datetime(2021, 1, 17, 9), tf1.start - timedelta(microseconds=1)),
+        TimeFrame(
+            tf1.end + timedelta(microseconds=1), tf2.start - timedelta(microseconds=1)
+        ),
+        TimeFrame(
+            tf2.end + timedelta(microseconds=1), tf3.start - timedelta(microseconds=1)
+        ),
+    ]
+    assert gaps == within - btf
+    assert btf.complement(within) == gaps
+
+
+def test_batch_timeframe_gaps_in_between():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+    btf = BatchTimeFrame([tf1, tf2])
+
+    assert btf.gaps().time_frames == [
+        TimeFrame(
+            tf1.end + timedelta(microseconds=1), tf2.start - timedelta(microseconds=1)
+        )
+    ]
+    assert BatchTimeFrame([tf1]).gaps().len_timeframes == 0
+    assert BatchTimeFrame([]).gaps().len_timeframes == 0
+
+
+def test_batch_timeframe_gaps_of_covered_bounds():
+    btf = BatchTimeFrame(
+        [TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 14))]
+    )
+
+    assert (
+        btf.gaps(
+            TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 12))
+        ).len_timeframes
+        == 0
+    )
+    # touching on the edge is not an overlap, same as `__sub__`
+    within = TimeFrame(datetime(2021, 1, 17, 14), datetime(2021, 1, 17, 15))
+    assert btf.gaps(within).time_frames == [within]
+
+    with pytest.raises(TypeError):
+        btf.gaps(btf)
+
+
+# ======================= Slots ============================
+def test_batch_timeframe_find_slot():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 13))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 16), datetime(2021, 1, 17, 17))
+    btf = BatchTimeFrame([tf1, tf2, tf3])
+    gap1 = TimeFrame(
+        tf1.end + timedelta(microseconds=1), tf2.start - timedelta(microseconds=1)
+    )
+    gap2 = TimeFrame(
+        tf2.end + timedelta(microseconds=1), tf3.start - timedelta(microseconds=1)
+    )
+
+    assert btf.find_slot(timedelta(minutes=30)) == gap1
+    assert btf.find_slot(timedelta(hours=2)) == gap2
+    assert btf.find_slot(timedelta(hours=3)) is None
+    assert btf.find_slot(timedelta(minutes=30), direction="backward") == gap2
+    assert btf.find_slot(timedelta(0), after=tf2.start) == gap2
+
+
+def test_batch_timeframe_find_slot_within_bounds():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 13))
+    btf = BatchTimeFrame([tf1, tf2])
+
+    after, before = datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 15)
+    assert btf.find_slot(timedelta(minutes=30), after, before) == TimeFrame(
+        after, tf1.start - timedelta(microseconds=1)
+    )
+    assert btf.find_slot(
+        timedelta(minutes=30), after, before, direction="backward"
+    ) == TimeFrame(tf2.end + timedelta(microseconds=1), before)
+    # the slot is clipped to the bounds
+    after = datetime(2021, 1, 17, 11, 30)
+    assert btf.find_slot(timedelta(minutes=20), after=after) == TimeFrame(
+        after, tf2.start - timedelta(microseconds=1)
+    )
+    assert btf.find_slot(timedelta(minutes=40), after=after) is None
+    # the same gaps as `gaps`
+    within = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 14))
+    assert (
+        btf.find_slot(timedelta(0), within.start, within.end)
+        == (btf.gaps(within).time_frames[0])
+    )
+
+    empty = BatchTimeFrame([])
+    assert empty.find_slot(timedelta(hours=1)) is None
+    assert empty.find_slot(timedelta(hours=1), after, before) == TimeFrame(
+        after, before
+    )
+
+
+def test_batch_timeframe_find_slot_after_a_change():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 14), datetime(2021, 1, 17, 15))
+    btf = BatchTimeFrame([tf1, tf2])
+    copy = btf.copy()
+    assert btf.find_slot(timedelta(hours=2)) is not None
+
+    btf.add(TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 13)))
+    assert btf.find_slot(timedelta(hours=2)) is None
+    assert copy.find_slot(timedelta(hours=2)) is not None
+
+    btf -= TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 14))
+    assert btf.find_slot(timedelta(hours=2)) is not None
+
+
+def test_batch_timeframe_find_slot_around_a_single_moment():
+    start = datetime(2021, 1, 17)
+    moment = start + timedelta(microseconds=2)
+    btf = BatchTimeFrame(
+        [
+            TimeFrame(start, start + timedelta(microseconds=1)),
+            TimeFrame(moment, moment),
+            TimeFrame(
+                start + timedelta(microseconds=8), start + timedelta(microseconds=12)
+            ),
+        ]
+    )
+    within = TimeFrame(start, start + timedelta(microseconds=20))
+
+    # the moment right after the first timeframe is taken, by both of them
+    assert btf.gaps(within).time_frames[0] == TimeFrame(
+        start + timedelta(microseconds=3), start + timedelta(microseconds=7)
+    )
+    assert btf.find_slot(timedelta(microseconds=5)) is None
+    assert btf.find_slot(
+        timedelta(microseconds=5), within.start, within.end
+    ) == TimeFrame(start + timedelta(microseconds=13), within.end)
+    assert btf.find_slot(timedelta(microseconds=4)) == TimeFrame(
+        start + timedelta(microseconds=3), start + timedelta(microseconds=7)
+    )
+
+
+def test_batch_timeframe_find_slot_agrees_with_gaps():
+    rng = random.Random(22)
+    start = datetime(2021, 1, 17)
+
+    def at(microseconds):
+        return start + timedelta(microseconds=microseconds)
+
+    for _ in range(300):
+        btf = BatchTimeFrame(
+            TimeFrame(at(lower), at(lower + rng.choice([0, 0, 1, 3, 10])))
+            for lower in (rng.randint(0, 200) for _ in range(rng.randint(1, 40)))
+        )
+        after, before = sorted(rng.sample(range(-10, 210), 2))
+        min_duration = rng.choice([0, 1, 2, 5, 20])
+
+        gaps = [
+            gap
+            for gap in btf.gaps(TimeFrame(at(after), at(before)))
+            if gap.duration_us >= min_duration
+        ]
+        forward = btf.find_slot(
+            timedelta(microseconds=min_duration), at(after), at(before)
+        )
+        backward = btf.find_slot(
+            timedelta(microseconds=min_duration), at(after), at(before), "backward"
+        )
+        assert forward == (gaps[0] if gaps else None)
+        assert backward == (gaps[-1] if gaps else None)
+
+
+def test_batch_timeframe_find_slot_keeps_up_with_changes_across_chunks():
+    start = datetime(2021, 1, 17)
+    btf = BatchTimeFrame(
+        [
+            TimeFrame(
+                start + timedelta(minutes=3 * i), start + timedelta(minutes=3 * i + 2)
+            )
+            for i in range(5000)
+        ]
+    )
+    assert btf.find_slot(timedelta(minutes=30)) is None
+
+    btf.discard(
+        TimeFrame(start + timedelta(minutes=9000), start + timedelta(minutes=9060))
+    )
+    assert btf.find_slot(timedelta(minutes=30)) == btf.gaps().time_frames[2999]
+    btf.discard(
+        TimeFrame(start + timedelta(minutes=3000), start + timedelta(minutes=9000))
+    )
+    assert btf.find_slot(timedelta(minutes=30)) == btf.gaps().time_frames[999]
+    assert (
+        btf.find_slot(timedelta(hours=2), direction="backward")
+        == (btf.gaps().time_frames[999])
+    )
+
+    btf.add(TimeFrame(start + timedelta(minutes=3000), start + timedelta(minutes=9060)))
+    assert btf.find_slot(timedelta(minutes=30)) is None
+
+
+def test_batch_timeframe_find_slot_raises():
+    btf = BatchTimeFrame(
+        [TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))]
+    )
+
+    with pytest.raises(TypeError):
+        btf.find_slot(3600)
+    with pytest.raises(TypeError):
+        btf.find_slot(timedelta(hours=1), after="10:00")
+    with pytest.raises(TypeError):
+        btf.find_slot(
+            timedelta(hours=1), after=datetime(2021, 1, 17, 9, tzinfo=timezone.utc)
+        )
+    with pytest.raises(ValueError):
+        btf.find_slot(timedelta(hours=-1))
+    with pytest.raises(ValueError):
+        btf.find_slot(timedelta(hours=1), direction="sideways")
+    with pytest.raises(ValueError):
+        btf.find_slot(
+            timedelta(hours=1),
+            after=datetime(2021, 1, 17, 11),
+            before=datetime(2021, 1, 17, 10),
+        )
+
+
+# ======================= Histogram ============================
+def test_batch_timeframe_histogram_splits_the_timeframes():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 12, 15))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 14), datetime(2021, 1, 17, 14, 20))
+    btf = BatchTimeFrame([tf1, tf2])
+
+    assert btf.histogram(
+        timedelta(hours=1), datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 16)
+    ) == [0, 1800, 3600, 900, 0, 1200, 0]
+    # the bounds default to the span of the batch, the last bucket cut short
+    assert btf.histogram(timedelta(hours=1)) == [3600, 2700, 0, 1200]
+    assert sum(btf.histogram(timedelta(minutes=7))) == btf.duration
+    assert btf.histogram(timedelta(days=1), end=datetime(2021, 1, 17, 11, 30)) == [3600]
+
+
+def test_batch_timeframe_histogram_of_an_empty_batch():
+    start, end = datetime(2021, 1, 17), datetime(2021, 1, 18)
+
+    assert BatchTimeFrame([]).histogram(timedelta(hours=1)) == []
+    assert BatchTimeFrame([]).histogram(timedelta(hours=6), start, end) == [0] * 4
+
+
+def test_batch_timeframe_histogram_raises():
+    btf = BatchTimeFrame(
+        [TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))]
+    )
+
+    with pytest.raises(TypeError):
+        btf.histogram(3600)
+    with pytest.raises(TypeError):
+        btf.histogram(timedelta(hours=1), start="10:00")
+    with pytest.raises(TypeError):
+        btf.histogram(
+            timedelta(hours=1), end=datetime(2021, 1, 17, 12, tzinfo=timezone.utc)
+        )
+    with pytest.raises(ValueError):
+        btf.histogram(timedelta(0))
+    with pytest.raises(ValueError):
+        btf.histogram(
+            timedelta(hours=1), datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 10)
+        )
+
+
 # ======================= Equality ============================
 def test_batch_timeframe_equals_another_identical_batch_timeframe():
     tf1 = TimeFrame(datetime(2021, 1, 18, 10), datetime(2021, 1, 18, 11))
@@ -588,3 +1206,143 @@ def test_batch_timeframe_multiple_timeframes_repr():
             ",", "\n"
         )
     )
+
+
+# ======================= Streaming ============================
+def test_normalize_coalesces_a_sorted_stream():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 10, 30), datetime(2021, 1, 17, 12))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 13))
+    tf4 = TimeFrame(datetime(2021, 1, 17, 18), datetime(2021, 1, 17, 20))
+
+    assert list(normalize(iter([tf1, tf2, tf3, tf4]))) == [
+        TimeFrame(tf1.start, tf3.end),
+        tf4,
+    ]
+    assert list(normalize([])) == []
+
+
+def test_normalize_is_lazy_on_an_unbounded_stream():
+    start = datetime(2021, 1, 17)
+    stream = (
+        TimeFrame(start + timedelta(hours=i), start + timedelta(hours=i, minutes=30))
+        for i in count()
+    )
+
+    assert list(islice(normalize(stream), 3)) == [
+        TimeFrame(start, start + timedelta(minutes=30)),
+        TimeFrame(start + timedelta(hours=1), start + timedelta(hours=1, minutes=30)),
+        TimeFrame(start + timedelta(hours=2), start + timedelta(hours=2, minutes=30)),
+    ]
+
+
+def test_normalize_raises_on_an_unsorted_stream():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+
+    with pytest.raises(ValueError):
+        list(normalize([tf2, tf1]))
+
+    with pytest.raises(TypeError):
+        list(normalize([tf1, 1]))
+
+
+def test_union_all_merges_many_batches():
+    start = datetime(2021, 1, 17)
+    batches = [
+        BatchTimeFrame(
+            TimeFrame(
+                start + timedelta(hours=hour, minutes=agent),
+                start + timedelta(hours=hour, minutes=agent + 20),
+            )
+            for hour in range(0, 24, agent + 1)
+        )
+        for agent in range(10)
+    ]
+
+    assert BatchTimeFrame.union_all(batches) == reduce(lambda x, y: x + y, batches)
+    assert BatchTimeFrame.union_all([]).len_timeframes == 0
+
+
+def test_iter_union_is_lazy_over_sorted_iterators():
+    start = datetime(2021, 1, 17)
+    evens = (
+        TimeFrame(start + timedelta(hours=i), start + timedelta(hours=i + 1))
+        for i in count(0, 2)
+    )
+    odds = (
+        TimeFrame(start + timedelta(hours=i), start + timedelta(hours=i, minutes=30))
+        for i in count(1, 2)
+    )
+    far = TimeFrame(start + timedelta(days=1), start + timedelta(days=2))
+
+    assert list(islice(iter_union([evens, odds, far]), 2)) == [
+        TimeFrame(start, start + timedelta(hours=1, minutes=30)),
+        TimeFrame(start + timedelta(hours=2), start + timedelta(hours=3, minutes=30)),
+    ]
+
+
+def test_iter_union_raises_on_bad_sources():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+
+    with pytest.raises(ValueError):
+        list(iter_union([[tf2, tf1], [tf1]]))
+
+    with pytest.raises(TypeError):
+        list(iter_union([[tf1, 1], [tf2]]))
+
+    with pytest.raises(TypeError):
+        list(iter_union([1]))
+
+
+def test_intersect_all_overlaps_many_batches():
+    start = datetime(2021, 1, 17)
+    batches = [
+        BatchTimeFrame(
+            TimeFrame(
+                start + timedelta(hours=hour, minutes=agent),
+                start + timedelta(hours=hour + 1, minutes=30 - agent),
+            )
+            for hour in range(0, 24, agent % 3 + 1)
+        )
+        for agent in range(10)
+    ]
+
+    assert BatchTimeFrame.intersect_all(batches) == reduce(lambda x, y: x * y, batches)
+    assert BatchTimeFrame.intersect_all(batches[:1]) == batches[0]
+    # touching on the edge is not an overlap
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 12))
+    assert BatchTimeFrame.intersect_all([[tf1], [tf2]]).len_timeframes == 0
+    assert BatchTimeFrame.intersect_all([[tf1], [tf1]]).time_frames == [tf1]
+
+
+def test_iter_intersection_stops_early_over_sorted_iterators():
+    start = datetime(2021, 1, 17)
+    hourly = (
+        TimeFrame(start + timedelta(hours=i), start + timedelta(hours=i, minutes=30))
+        for i in count()
+    )
+    day = TimeFrame(start, start + timedelta(days=1))
+
+    # the endless one is only read up to the end of the other ones
+    assert len(list(iter_intersection([hourly, day, BatchTimeFrame([day])]))) == 24
+    assert list(iter_intersection([BatchTimeFrame([]), count()])) == []
+
+
+def test_iter_intersection_raises_on_bad_sources():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 14))
+
+    with pytest.raises(ValueError):
+        list(iter_intersection([]))
+
+    with pytest.raises(ValueError):
+        list(iter_intersection([[tf2, tf1], [tf1]]))
+
+    with pytest.raises(TypeError):
+        list(iter_intersection([[tf1, 1], [tf2]]))
+
+    with pytest.raises(TypeError):
+        list(iter_intersection([1]))
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from timeframe import BatchTimeFrame, TimeFrame, at_least, at_most, depth_profile
+
+
+# ======================= Depth ============================
+def test_depth_profile_counts_the_active_timeframes():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 11, 30), datetime(2021, 1, 17, 11, 45))
+    tf4 = TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 14))
+
+    profile = depth_profile([tf1, tf2, tf3, tf4])
+
+    assert profile.depth_at(datetime(2021, 1, 17, 9)) == 0
+    assert profile.depth_at(datetime(2021, 1, 17, 10)) == 1
+    assert profile.depth_at(datetime(2021, 1, 17, 11, 40)) == 3
+    assert profile.depth_at(datetime(2021, 1, 17, 12, 30)) == 1
+    assert profile.depth_at(datetime(2021, 1, 17, 13)) == 2  # both ends included
+    assert profile.depth_at(datetime(2021, 1, 17, 15)) == 0
+
+
+def test_depth_profile_peak_and_at_least():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 11, 30), datetime(2021, 1, 17, 11, 45))
+
+    profile = depth_profile([tf1, tf2, tf3])
+
+    assert profile.peak == 3
+    assert profile.peaks == BatchTimeFrame([tf3])
+    assert profile.at_least(1) == BatchTimeFrame([tf1, tf2])
+    assert profile.at_least(2) == BatchTimeFrame([tf1 * tf2])
+    assert profile.at_least(4).len_timeframes == 0
+
+    with pytest.raises(ValueError):
+        profile.at_least(0)
+
+
+def test_depth_profile_steps():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 14), datetime(2021, 1, 17, 15))
+
+    profile = depth_profile([tf1, tf2, tf2])
+
+    assert list(profile) == [(tf1, 1), (tf2, 2)]
+    assert len(depth_profile([])) == 0
+    assert depth_profile([]).peak == 0
+
+    with pytest.raises(TypeError):
+        depth_profile([tf1, 1])
+
+
+def test_depth_profile_never_mixes_naive_and_aware():
+    naive = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    aware = TimeFrame(
+        datetime(2021, 1, 17, 12, tzinfo=timezone.utc),
+        datetime(2021, 1, 17, 13, tzinfo=timezone.utc),
+    )
+
+    with pytest.raises(TypeError):
+        depth_profile([naive, aware])
+    with pytest.raises(TypeError):
+        at_least([[naive], [aware]], 1)
+
+
+# ======================= Quorum ============================
+def test_at_least_k_of_the_sources():
+    morning = TimeFrame(datetime(2021, 1, 17, 8), datetime(2021, 1, 17, 12))
+    midday = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 14))
+    late = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 18))
+    # overlapping timeframes of the same source count once
+    sources = [[morning, morning], BatchTimeFrame([midday]), late]
+
+    assert at_least(sources, 1) == BatchTimeFrame([morning, midday, late])
+    assert at_least(sources, 2) == BatchTimeFrame(
+        [TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 14))]
+    )
+    assert at_least(sources, 3) == BatchTimeFrame([morning * midday * late])
+    assert at_least(sources, 4).len_timeframes == 0
+
+    within = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 11, 30))
+    assert at_least(sources, 3, within).time_frames == [
+        TimeFrame(datetime(2021, 1, 17, 11), within.end)
+    ]
+
+    with pytest.raises(ValueError):
+        at_least(sources, 0)
+
+
+def test_at_most_k_of_the_sources():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    one_us = timedelta(microseconds=1)
+
+    assert at_most([[tf1], [tf2]], 1).time_frames == [
+        TimeFrame(tf1.start, tf2.start - one_us),
+        TimeFrame(tf1.end + one_us, tf2.end),
+    ]
+    # nothing active counts as well, within the bounds
+    within = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 14))
+    assert at_most([[tf1], [tf2]], 0, within).time_frames == [
+        TimeFrame(within.start, tf1.start - one_us),
+        TimeFrame(tf2.end + one_us, within.end),
+    ]
+    assert at_most([[tf1], [tf2]], 2, within).time_frames == [within]
+    assert at_most([], 0).len_timeframes == 0
+    assert at_most([], 0, within).time_frames == [within]
+
+    with pytest.raises(ValueError):
+        at_most([[tf1]], -1)
+    with pytest.raises(TypeError):
+        at_most([[tf1]], 1, within=[tf1])
+    with pytest.raises(TypeError):
+        at_most([1], 1)
@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from timeframe import IntervalIndex, TimeFrame
+
+
+# ======================= Initialization ============================
+def test_interval_index_keeps_every_timeframe():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 10))
+
+    index = IntervalIndex([tf1, tf2, tf3, tf1], payloads=["a", "b", "c", "d"])
+
+    assert len(index) == 4
+    assert list(index) == [(tf3, "c"), (tf1, "a"), (tf1, "d"), (tf2, "b")]
+
+
+def test_interval_index_raises_on_wrong_input():
+    tf = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+
+    with pytest.raises(TypeError):
+        IntervalIndex(1)
+
+    with pytest.raises(TypeError):
+        IntervalIndex([tf, datetime(2021, 1, 17)])
+
+    with pytest.raises(ValueError):
+        IntervalIndex([tf], payloads=[1, 2])
+
+    with pytest.raises(TypeError):
+        IntervalIndex().add(datetime(2021, 1, 17))
+
+
+def test_interval_index_leaves_the_global_random_state_alone():
+    tf = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+
+    random.seed(42)
+    expected = random.random()
+    random.seed(42)
+    IntervalIndex([tf, tf, tf]).add(tf)
+    assert random.random() == expected
+
+
+def test_interval_index_never_mixes_naive_and_aware():
+    naive = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    aware = TimeFrame(
+        datetime(2021, 1, 17, 12, tzinfo=timezone.utc),
+        datetime(2021, 1, 17, 13, tzinfo=timezone.utc),
+    )
+    index = IntervalIndex([naive])
+
+    with pytest.raises(TypeError):
+        IntervalIndex([naive, aware])
+    with pytest.raises(TypeError):
+        index.add(aware)
+    with pytest.raises(TypeError):
+        index.stab(datetime(2021, 1, 17, 11, tzinfo=timezone.utc))
+    with pytest.raises(TypeError):
+        index.overlap(aware)
+
+
+# ======================= Queries ============================
+def test_interval_index_stab_returns_the_timeframes_containing_a_datetime():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 10))
+    index = IntervalIndex([tf1, tf2, tf3], payloads=[1, 2, 3])
+
+    assert index.stab(datetime(2021, 1, 17, 10)) == [(tf3, 3), (tf1, 1)]
+    assert index.stab(datetime(2021, 1, 17, 11, 30)) == [(tf1, 1), (tf2, 2)]
+    assert index.stab(datetime(2021, 1, 17, 14)) == []
+
+
+def test_interval_index_overlap_matches_timeframe_multiplication():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 10))
+    tf4 = TimeFrame(datetime(2021, 1, 17, 15), datetime(2021, 1, 17, 16))
+    index = IntervalIndex([tf1, tf2, tf3, tf4])
+    window = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11, 30))
+
+    assert index.overlap(window) == [(tf1, None), (tf2, None)]
+    assert [tf for tf, _ in index.overlap(window)] == [
+        tf for tf in (tf1, tf2, tf3, tf4) if window._has_common_ground(tf)
+    ]
+
+
+# ======================= Mutation ============================
+def test_interval_index_add_and_discard():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    index = IntervalIndex()
+
+    index.add(tf1, "a")
+    index.add(tf1, "b")
+    index.add(tf2)
+    assert len(index) == 3
+
+    index.discard(tf1, "b")
+    index.discard(tf1, "missing")
+    assert list(index) == [(tf1, "a"), (tf2, None)]
+
+    index.discard(tf2)
+    index.discard(tf1, "a")
+    assert len(index) == 0
+    assert index.stab(datetime(2021, 1, 17, 11)) == []
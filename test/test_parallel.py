@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from timeframe import BatchTimeFrame, TimeFrame, parallel
+
+
+@pytest.fixture(autouse=True)
+def small_partitions(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_PARTITION", 10)
+
+
+def random_frames(seed: int, size: int):
+    rng = random.Random(seed)
+    base = datetime(2021, 1, 17)
+    time_frames = []
+    for _ in range(size):
+        start = base + timedelta(minutes=rng.randint(0, 10_000))
+        time_frames.append(
+            TimeFrame(start, start + timedelta(minutes=rng.randint(0, 60)))
+        )
+    return time_frames
+
+
+# ======================= Parallel ============================
+def test_from_frames_with_workers():
+    time_frames = random_frames(0, 500)
+
+    btf = BatchTimeFrame.from_frames(time_frames, workers=3)
+
+    assert isinstance(btf, BatchTimeFrame)
+    assert btf == BatchTimeFrame(time_frames)
+
+
+def test_from_frames_with_workers_merges_across_partitions():
+    # one long timeframe covering all the others, whichever partition they're in
+    time_frames = random_frames(1, 200) + [
+        TimeFrame(datetime(2021, 1, 16), datetime(2021, 1, 30))
+    ]
+
+    btf = BatchTimeFrame.from_frames(time_frames, workers=4)
+
+    assert btf.time_frames == [TimeFrame(datetime(2021, 1, 16), datetime(2021, 1, 30))]
+
+
+def test_from_frames_with_workers_and_an_empty_partition():
+    # every start is the same, so all of them fall into a single partition
+    start = datetime(2021, 1, 17)
+    time_frames = [TimeFrame(start, start + timedelta(minutes=n)) for n in range(40)]
+
+    btf = BatchTimeFrame.from_frames(time_frames, workers=3)
+
+    assert btf.time_frames == [time_frames[-1]]
+
+
+def test_from_frames_with_too_few_frames_for_the_pool():
+    time_frames = random_frames(2, 15)
+
+    assert BatchTimeFrame.from_frames(time_frames, workers=4) == BatchTimeFrame(
+        time_frames
+    )
+    assert BatchTimeFrame.from_frames([], workers=4).len_timeframes == 0
+
+
+def test_parallel_rejects_wrong_input():
+    with pytest.raises(TypeError):
+        BatchTimeFrame.from_frames([1, 2, 3], workers=2)
+    with pytest.raises(ValueError):
+        BatchTimeFrame.from_frames([], workers=0)
+
+
+def test_parallel_never_mixes_naive_and_aware():
+    naive = random_frames(5, 30)
+    aware = [
+        TimeFrame(
+            tf.start.replace(tzinfo=timezone.utc), tf.end.replace(tzinfo=timezone.utc)
+        )
+        for tf in random_frames(6, 30)
+    ]
+
+    with pytest.raises(TypeError):
+        BatchTimeFrame.from_frames(naive + aware, workers=2)
@@ -0,0 +1,128 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import timeframe
+from timeframe import BatchTimeFrame, IntervalIndex, TimeFrame, profile, profiling
+
+
+# ======================= Profiling ============================
+def test_profile_counts_the_operations():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 15))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 14))
+    btf1 = BatchTimeFrame([tf1, tf2])
+    btf2 = BatchTimeFrame([tf3])
+
+    with profile() as stats:
+        result = btf1 * btf2
+        btf1 * btf2
+
+    multiplication = stats["BatchTimeFrame.__mul__"]
+    assert multiplication.calls == 2
+    assert multiplication.input_size == 6
+    assert multiplication.output_size == 2 * result.len_timeframes
+    assert multiplication.comparisons > 0
+    assert multiplication.seconds > 0
+    assert "BatchTimeFrame.__add__" not in stats
+    assert "BatchTimeFrame.__mul__" in str(stats)
+    assert stats.as_dict()["BatchTimeFrame.__mul__"]["calls"] == 2
+
+
+def test_profile_reports_in_place_and_nested_operations():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 15))
+    btf = BatchTimeFrame([tf1])
+
+    with profile() as stats:
+        btf += tf2
+        index = IntervalIndex([tf1, tf2])
+        index.stab(datetime(2021, 1, 17, 11))
+
+    assert stats["BatchTimeFrame.__iadd__"].output_size == 2
+    assert stats["BatchTimeFrame.add"].calls == 1
+    assert stats["IntervalIndex.__init__"].input_size == 2
+    assert stats["IntervalIndex.stab"].output_size == 1
+
+
+def test_profile_covers_the_queries_and_the_helpers():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 15))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 14))
+    btf = BatchTimeFrame([tf1, tf2])
+
+    with profile() as stats:
+        btf.find_slot(timedelta(minutes=30))
+        btf.complement(tf3)
+        btf.histogram(timedelta(hours=1))
+        BatchTimeFrame.from_frames([tf1, tf2, tf3])
+        BatchTimeFrame.intersect_all([btf, [tf3]])
+        timeframe.depth_profile([tf1, tf2, tf3]).at_least(2)
+        timeframe.at_most([[tf1], [tf3]], 1)
+        IntervalIndex([tf1, tf2]).overlap(tf3)
+
+    for operation in (
+        "BatchTimeFrame.find_slot",
+        "BatchTimeFrame.gaps",
+        "BatchTimeFrame.complement",
+        "BatchTimeFrame.histogram",
+        "BatchTimeFrame.from_frames",
+        "BatchTimeFrame.intersect_all",
+        "depth_profile",
+        "DepthProfile.at_least",
+        "at_most",
+        "IntervalIndex.overlap",
+    ):
+        assert stats[operation].calls >= 1, operation
+    assert stats["BatchTimeFrame.intersect_all"].comparisons > 0
+    assert timeframe.depth_profile is timeframe.depth.depth_profile
+
+
+def test_profile_counts_the_comparisons_of_each_thread_on_its_own():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 13))
+    main = threading.current_thread()
+    events = []
+
+    def record(event):
+        if threading.current_thread() is not main:
+            return
+        if event.operation == "BatchTimeFrame.add" and thread.ident is None:
+            # another thread compares a lot while this one is in the middle of it
+            thread.start()
+            thread.join()
+        events.append(event)
+
+    thread = threading.Thread(target=BatchTimeFrame, args=([tf1, tf2] * 1000,))
+    btf = BatchTimeFrame([tf1])
+    profiling.add_hook(record)
+    try:
+        btf + tf2
+    finally:
+        profiling.remove_hook(record)
+
+    assert events[-1].operation == "BatchTimeFrame.__add__"
+    assert events[-1].comparisons < 10
+
+
+def test_profiling_is_removed_afterwards():
+    multiply = BatchTimeFrame.__mul__
+    from_iterable = BatchTimeFrame.__dict__["from_iterable"]
+    events = []
+
+    profiling.add_hook(events.append)
+    with profile():
+        assert BatchTimeFrame.__mul__ is not multiply
+    assert BatchTimeFrame.__mul__ is not multiply  # the hook is still there
+    BatchTimeFrame.from_iterable([])
+    profiling.remove_hook(events.append)
+
+    assert BatchTimeFrame.__mul__ is multiply
+    assert BatchTimeFrame.__dict__["from_iterable"] is from_iterable
+    assert [event.operation for event in events] == [
+        "BatchTimeFrame.from_iterable",
+    ]
+
+    with pytest.raises(ValueError):
+        profiling.remove_hook(events.append)
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from timeframe import BatchTimeFrame, MappedBatchTimeFrame, TimeFrame, storage
+
+
+@pytest.fixture
+def batch():
+    return BatchTimeFrame(
+        [
+            TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12)),
+            TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 15)),
+            TimeFrame(datetime(2021, 1, 17, 17), datetime(2021, 1, 17, 18)),
+        ]
+    )
+
+
+# ======================= Storage ============================
+def test_open_mapped_batch(batch, tmp_path):
+    path = tmp_path / "batch.tf"
+    batch.save(path)
+
+    with BatchTimeFrame.open(path) as mapped:
+        assert isinstance(mapped, MappedBatchTimeFrame)
+        assert mapped == batch
+        assert batch == mapped
+        assert mapped.len_timeframes == 3
+        assert mapped.duration_us == batch.duration_us
+        assert mapped.start == datetime(2021, 1, 17, 10)
+        assert mapped.end == datetime(2021, 1, 17, 18)
+        assert datetime(2021, 1, 17, 11) in mapped
+        assert datetime(2021, 1, 17, 12, 30) not in mapped
+        assert TimeFrame(datetime(2021, 1, 17, 13), datetime(2021, 1, 17, 14)) in mapped
+        assert mapped.locate_many(
+            [datetime(2021, 1, 17, 9), datetime(2021, 1, 17, 17, 30)]
+        ) == [-1, 2]
+
+
+def test_open_loaded_batch(batch, tmp_path):
+    path = tmp_path / "batch.tf"
+    batch.save(path)
+
+    loaded = BatchTimeFrame.open(path, mmap=False)
+
+    assert isinstance(loaded, BatchTimeFrame)
+    assert loaded == batch
+
+
+def test_mapped_batch_set_algebra(batch, tmp_path):
+    path = tmp_path / "batch.tf"
+    batch.save(path)
+    tf = TimeFrame(datetime(2021, 1, 17, 11), datetime(2021, 1, 17, 14))
+
+    with BatchTimeFrame.open(path) as mapped:
+        assert mapped + tf == batch + tf
+        assert tf + mapped == tf + batch
+        assert mapped * tf == batch * tf
+        assert mapped - tf == batch - tf
+        assert tf - mapped == tf - batch
+
+
+def test_save_keeps_the_utc_offset(tmp_path):
+    tz = timezone(timedelta(hours=3, minutes=30))
+    tf = TimeFrame(
+        datetime(2021, 1, 17, 10, tzinfo=tz), datetime(2021, 1, 17, 12, tzinfo=tz)
+    )
+    path = tmp_path / "batch.tf"
+    BatchTimeFrame([tf]).save(path)
+
+    with BatchTimeFrame.open(path) as mapped:
+        assert mapped.start == tf.start
+        assert mapped.start.utcoffset() == timedelta(hours=3, minutes=30)
+    assert BatchTimeFrame.open(path, mmap=False).end.tzinfo == tz
+
+
+def test_save_and_open_an_empty_batch(tmp_path):
+    path = tmp_path / "batch.tf"
+    BatchTimeFrame([]).save(path)
+
+    with BatchTimeFrame.open(path) as mapped:
+        assert mapped.len_timeframes == 0
+        assert mapped.start is None
+        assert datetime(2021, 1, 17) not in mapped
+
+
+def test_save_an_empty_timeframe(tmp_path):
+    path = tmp_path / "batch.tf"
+    empty = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11)) * TimeFrame(
+        datetime(2021, 1, 17, 12), datetime(2021, 1, 17, 13)
+    )
+    storage.save(empty, path)
+
+    with BatchTimeFrame.open(path) as mapped:
+        assert mapped.len_timeframes == 0
+        assert mapped.start is None
+
+    BatchTimeFrame([empty]).save(path)
+    assert BatchTimeFrame.open(path, mmap=False) == BatchTimeFrame([])
+
+
+def test_open_rejects_other_files(batch, tmp_path):
+    path = tmp_path / "batch.tf"
+    path.write_bytes(b"not a timeframe file at all, not even close")
+    with pytest.raises(ValueError):
+        BatchTimeFrame.open(path)
+
+    batch.save(path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        BatchTimeFrame.open(path)
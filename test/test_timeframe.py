@@ -1,7 +1,11 @@
-from datetime import datetime, timedelta
+import pickle
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
+import timeframe
 from timeframe import BatchTimeFrame, TimeFrame
 
 
@@ -32,6 +36,50 @@ def test_timeframe_incorrect_type_raises_error():
         TimeFrame("dummy", dt)
 
 
+def test_timeframe_hands_out_both_ends_in_the_timezone_of_the_start():
+    utc = timezone.utc
+    tehran = timezone(timedelta(hours=3, minutes=30))
+    start = datetime(2021, 1, 15, 12, 30, 15, 123456, tzinfo=tehran)
+    end = datetime(2021, 1, 15, 16, tzinfo=utc)
+    tf = TimeFrame(start, end)
+
+    assert tf.start == start and tf.start.tzinfo is tehran
+    assert tf.end == end and tf.end.tzinfo is tehran
+    assert TimeFrame(start.replace(tzinfo=None), end.replace(tzinfo=None)).end == (
+        end.replace(tzinfo=None)
+    )
+
+
+def test_timeframe_mixing_naive_and_aware_raises_error():
+    naive, aware = datetime(2021, 1, 15), datetime(2021, 1, 16, tzinfo=timezone.utc)
+
+    with pytest.raises(TypeError):
+        TimeFrame(naive, aware)
+
+    with pytest.raises(TypeError):
+        TimeFrame(naive.replace(tzinfo=timezone.utc), aware.replace(tzinfo=None))
+
+
+def test_timeframe_naive_and_aware_are_never_compared():
+    naive = TimeFrame(datetime(2021, 1, 15), datetime(2021, 1, 16))
+    aware = TimeFrame(
+        datetime(2021, 1, 15, tzinfo=timezone.utc),
+        datetime(2021, 1, 16, tzinfo=timezone.utc),
+    )
+
+    with pytest.raises(TypeError):
+        datetime(2021, 1, 15, 12) in aware
+    with pytest.raises(TypeError):
+        datetime(2021, 1, 15, 12, tzinfo=timezone.utc) in naive
+    with pytest.raises(TypeError):
+        naive in aware
+    with pytest.raises(TypeError):
+        naive > aware
+    with pytest.raises(TypeError):
+        naive >= aware
+    assert naive != aware
+
+
 # ======================= Inclusion ============================
 def test_timeframe_includes_datetimes_between_start_and_end():
     dt1, dt2 = datetime(2021, 1, 15, 11, 15), datetime(2021, 1, 15, 11, 45)
@@ -150,6 +198,45 @@ def test_timeframe_inclusion_check_with_include_warns_deprecation(
 def test_timeframe_duration_calculation_is_correct():
     tf = TimeFrame(datetime(2021, 1, 15, 12), datetime(2021, 1, 15, 13))
     assert tf.duration == 3600.0
+    assert tf.duration_us == 3_600_000_000
+
+
+def test_timeframe_duration_is_exact_to_the_microsecond():
+    tf = TimeFrame(
+        datetime(2021, 1, 15, 12), datetime(2021, 1, 15, 12, 0, 0, microsecond=1)
+    )
+    assert tf.duration_us == 1
+
+    utc = timezone.utc
+    tehran = timezone(timedelta(hours=3, minutes=30))
+    tf = TimeFrame(
+        datetime(2021, 1, 15, 12, tzinfo=utc), datetime(2021, 1, 15, 16, tzinfo=tehran)
+    )
+    assert tf.duration_us == 30 * 60 * 1_000_000
+
+
+def test_timeframe_duration_is_the_elapsed_time_across_daylight_saving():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        new_york = zoneinfo.ZoneInfo("America/New_York")
+    except zoneinfo.ZoneInfoNotFoundError:  # pragma: no cover
+        pytest.skip("no timezone database")
+
+    # the clocks jump from 2 to 3 o'clock, it's 4 hours on the wall clock
+    spring = TimeFrame(
+        datetime(2021, 3, 14, tzinfo=new_york),
+        datetime(2021, 3, 14, 4, tzinfo=new_york),
+    )
+    assert spring.duration == 3 * 3600
+    assert spring.end == datetime(2021, 3, 14, 4, tzinfo=new_york)
+
+    # 1:30 happens twice, the second time an hour after the first one
+    first = datetime(2021, 11, 7, 1, 30, tzinfo=new_york)
+    second = first.replace(fold=1)
+    fall = TimeFrame(first, second)
+    assert fall.duration == 3600
+    assert fall.end.fold == 1
+    assert TimeFrame(second, second) > TimeFrame(first, first)
 
 
 # ======================= Greater Than ============================
@@ -544,3 +631,69 @@ def test_timeframe_subtraction_from_empty_returns_self(empty_timeframe):
     tf1 = TimeFrame(datetime(2022, 2, 22), datetime(2022, 2, 23))
 
     assert tf1 - empty_timeframe is tf1
+
+
+# ======================= Hash ============================
+def test_timeframe_equal_instances_have_the_same_hash():
+    tf1 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf2 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    tf3 = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 12))
+
+    assert hash(tf1) == hash(tf2)
+    assert len({tf1, tf2, tf3}) == 2
+
+
+def test_timeframe_equal_instances_in_different_timezones_have_the_same_hash():
+    utc = timezone.utc
+    tehran = timezone(timedelta(hours=3, minutes=30))
+    tf1 = TimeFrame(
+        datetime(2021, 1, 17, 10, tzinfo=utc), datetime(2021, 1, 17, 11, tzinfo=utc)
+    )
+    tf2 = TimeFrame(
+        datetime(2021, 1, 17, 13, 30, tzinfo=tehran),
+        datetime(2021, 1, 17, 14, 30, tzinfo=tehran),
+    )
+
+    assert tf1 == tf2
+    assert hash(tf1) == hash(tf2)
+
+
+def test_timeframe_survives_a_pickle_round_trip():
+    tf = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+    hash(tf)
+
+    assertion = pickle.loads(pickle.dumps(tf))
+
+    assert assertion == tf
+    assert hash(assertion) == hash(tf)
+
+
+def test_timeframe_is_immutable():
+    tf = TimeFrame(datetime(2021, 1, 17, 10), datetime(2021, 1, 17, 11))
+
+    with pytest.raises(AttributeError):
+        tf.start = datetime(2021, 1, 17, 9)
+
+    with pytest.raises(AttributeError):
+        tf.dummy = True
+
+
+# ======================= Package ============================
+def test_package_imports_the_heavy_modules_only_when_asked_for():
+    script = """
+import sys
+import timeframe
+heavy = ("asyncio", "concurrent.futures", "mmap", "numpy", "timeframe.array")
+assert not any(map(sys.modules.__contains__, heavy)), sys.modules.keys() & heavy
+assert timeframe.MappedBatchTimeFrame is timeframe.storage.MappedBatchTimeFrame
+assert "mmap" in sys.modules
+from timeframe import AsyncCoverageAggregator, parallel
+assert "asyncio" in sys.modules
+with timeframe.profile():
+    pass
+assert "timeframe.array" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    with pytest.raises(AttributeError):
+        timeframe.Nothing
@@ -1,10 +1,58 @@
-from .timeframe import BatchTimeFrame, TimeFrame
+import importlib
+
+from .depth import DepthProfile, at_least, at_most, depth_profile
+from .index import IntervalIndex
+from .profiling import profile
+from .timeframe import (
+    BatchTimeFrame,
+    TimeFrame,
+    iter_intersection,
+    iter_union,
+    normalize,
+)
 
 __all__ = (
+    "ArrayBatchTimeFrame",
+    "AsyncCoverageAggregator",
     "BatchTimeFrame",
+    "DepthProfile",
+    "IntervalIndex",
+    "MappedBatchTimeFrame",
     "TimeFrame",
+    "at_least",
+    "at_most",
+    "depth_profile",
+    "iter_intersection",
+    "iter_union",
+    "normalize",
+    "profile",
 )
 
+# the ones pulling in asyncio, numpy, a process pool or mmap are only imported
+# once they're asked for, e.g. `from timeframe import ArrayBatchTimeFrame`
+_LAZY = {
+    "ArrayBatchTimeFrame": "array",
+    "AsyncCoverageAggregator": "aio",
+    "MappedBatchTimeFrame": "storage",
+}
+_SUBMODULES = ("aio", "archive", "array", "parallel", "storage")
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY, *_SUBMODULES})
+
+
 __name__ = "timeframe"
 __author__ = "Meysam Azad"
 __author_email__ = "MeysamAzad81@gmail.com"
@@ -0,0 +1,146 @@
+import asyncio
+import heapq
+from itertools import chain
+from typing import AsyncIterable, List, Optional
+
+from .timeframe import (
+    _START_KEY,
+    BaseTimeFrame,
+    BatchTimeFrame,
+    TimeFrame,
+    _check_aware,
+    _Empty,
+    normalize,
+)
+
+# the timeframes handled in between two chances for other tasks to run
+YIELD_EVERY = 1024
+
+
+async def _merge(run1: List[TimeFrame], run2: List[TimeFrame]) -> List[TimeFrame]:
+    """The union of two normalized runs, letting other tasks run regularly"""
+    result = []
+    frames = heapq.merge(run1, run2, key=_START_KEY)
+    # the sweep of `BatchTimeFrame._normalize`, the runs being checked already
+    head = last = next(frames)
+    end = head._end_us
+    # counted on the input, as a long timeframe may swallow all of the others
+    for count, tf in enumerate(frames, 1):
+        if count % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+
+        if tf._start_us <= end:
+            if tf._end_us > end:
+                last, end = tf, tf._end_us
+            continue
+
+        result.append(head if last is head else TimeFrame._span(head, last))
+        head = last = tf
+        end = tf._end_us
+
+    result.append(head if last is head else TimeFrame._span(head, last))
+    return result
+
+
+class AsyncCoverageAggregator:
+    """The union of the timeframes coming from any number of async sources
+
+    Timeframes are buffered, then normalized `flush_size` at a time into runs
+    which are merged pairwise whenever the last one grows as large as the one
+    before it; each timeframe is merged O(log n) times, and the merges let
+    other tasks run regularly. A snapshot is the union so far, unaffected by
+    whatever comes next, even in the middle of a merge.
+    """
+
+    __slots__ = ("_runs", "_pending", "_flush_size", "_lock")
+
+    def __init__(self, flush_size: int = 1024):
+        if flush_size < 1:
+            raise ValueError(f"flush_size should be at least 1: {flush_size}")
+
+        # normalized runs, each one at least as long as the next one
+        self._runs: List[List[TimeFrame]] = []
+        self._pending: List[TimeFrame] = []
+        self._flush_size = flush_size
+        # created on first use, as it's bound to the running loop up to 3.9
+        self._lock = None
+
+    def add(self, tf: BaseTimeFrame):
+        """Buffer a timeframe, it's merged by the next flush or snapshot"""
+        if not BatchTimeFrame._is_timeframe_or_empty(tf):
+            raise TypeError(f"{tf} should be a TimeFrame")
+        if not isinstance(tf, _Empty):
+            _check_aware(self._aware, tf._aware)
+            self._pending.append(tf)
+
+    @property
+    def _aware(self) -> Optional[bool]:
+        """Whether the timeframes are aware, or None if there's none yet"""
+        first = self._runs[0][0] if self._runs else next(iter(self._pending), None)
+        return None if first is None else first._aware
+
+    async def flush(self):
+        """Merge the buffered timeframes, one flush at a time"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._pending:
+                return
+
+            run = BatchTimeFrame._normalize(self._pending)
+            self._pending = []
+            runs = self._runs
+            if runs and runs[-1][-1]._start_us <= run[0]._start_us:
+                # in order, as most streams are, so only the last one can overlap
+                last = runs[-1]
+                last[-1:] = normalize(chain(last[-1:], run))
+            else:
+                runs.append(run)
+            await self._merge_runs(lambda runs: len(runs[-2]) <= len(runs[-1]))
+
+    async def _merge_runs(self, condition):
+        runs = self._runs
+        while len(runs) > 1 and condition(runs):
+            # the two runs are kept until they're replaced by the merged one
+            runs[-2:] = [await _merge(runs[-2], runs[-1])]
+
+    async def _collapse(self):
+        """Merge everything into a single run"""
+        await self.flush()
+        async with self._lock:  # created by the flush
+            await self._merge_runs(lambda _: True)
+
+    async def consume(self, source: AsyncIterable[BaseTimeFrame]):
+        """Add every timeframe of `source`, flushing every `flush_size` of them"""
+        if not isinstance(source, AsyncIterable):
+            raise TypeError(f"{source} should be an async iterable")
+
+        count = 0
+        async for tf in source:
+            self.add(tf)
+            count += 1
+            if len(self._pending) >= self._flush_size:
+                await self.flush()
+            elif count % YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+    async def consume_all(self, *sources: AsyncIterable[BaseTimeFrame]):
+        """Consume all the sources concurrently"""
+        await asyncio.gather(*map(self.consume, sources))
+
+    def snapshot(self) -> BatchTimeFrame:
+        """The union of everything added so far"""
+        if len(self._runs) == 1 and not self._pending:
+            return BatchTimeFrame._from_normalized(self._runs[0])
+
+        # the runs are sorted already, which the sort takes advantage of
+        time_frames = list(chain(*self._runs, self._pending))
+        return BatchTimeFrame._from_normalized(BatchTimeFrame._normalize(time_frames))
+
+
+async def from_async_iter(time_frames: AsyncIterable[BaseTimeFrame]) -> BatchTimeFrame:
+    """`BatchTimeFrame(time_frames)` for an async iterable, see the aggregator"""
+    aggregator = AsyncCoverageAggregator()
+    await aggregator.consume(time_frames)
+    await aggregator._collapse()
+    return aggregator.snapshot()
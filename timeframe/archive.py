@@ -0,0 +1,156 @@
+import os
+import struct
+from bisect import bisect_right
+from datetime import datetime, tzinfo
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .storage import _columns, _offset_of, _tz_of
+from .timeframe import (
+    BaseTimeFrame,
+    BatchTimeFrame,
+    TimeFrame,
+    _check_aware,
+    _is_aware,
+    _to_us,
+)
+
+# magic, version, flags, utc offset in seconds, timeframes
+HEADER = struct.Struct("<4sHHiq")
+# the first start of a chunk & where it begins in the file
+ENTRY = struct.Struct("<qQ")
+# where the seek table begins & the number of chunks
+FOOTER = struct.Struct("<QQ")
+MAGIC = b"TFAR"
+VERSION = 1
+CHUNK_SIZE = 4096
+
+
+def _append_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _varints(data: bytes) -> Iterator[int]:
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def _encode(starts: List[int], ends: List[int]) -> bytes:
+    """One chunk, counted from right before its first start"""
+    out = bytearray()
+    previous = starts[0] - 1
+    for start, end in zip(starts, ends):
+        # normalized timeframes never touch, hence a gap of at least 1µs
+        _append_varint(out, start - previous - 1)
+        _append_varint(out, end - start)
+        previous = end
+    return bytes(out)
+
+
+def dump(
+    tf: BaseTimeFrame, path: Union[str, os.PathLike], chunk_size: int = CHUNK_SIZE
+):
+    """Write a batch to an archive, in chunks of `chunk_size` timeframes
+
+    Normalized timeframes are sorted & apart from each other, so each one is
+    stored as two varints: the gap since the previous end, then the length.
+    A seek table after the chunks tells where each of them starts, both in
+    time & in the file. Aware timeframes are stored in the utc offset of the
+    earliest one. The file is replaced atomically, the same as by `save`, so
+    that a reader never sees it half written.
+    """
+    if not isinstance(tf, BaseTimeFrame):
+        raise TypeError(f"{tf} should be a BaseTimeFrame")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size should be at least 1: {chunk_size}")
+
+    starts, ends = _columns(tf)
+    flags, seconds = _offset_of(tf)
+
+    path = os.fspath(path)
+    temporary = f"{path}.tmp"
+    table = []
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, seconds, len(starts)))
+        for lower in range(0, len(starts), chunk_size):
+            upper = lower + chunk_size
+            table.append(ENTRY.pack(starts[lower], f.tell()))
+            f.write(_encode(starts[lower:upper], ends[lower:upper]))
+
+        table_offset = f.tell()
+        f.write(b"".join(table))
+        f.write(FOOTER.pack(table_offset, len(table)))
+    os.replace(temporary, path)
+
+
+def _read_table(f, path) -> Tuple[int, Optional[tzinfo], List[int], List[int]]:
+    """The header & the seek table: count, tz, first starts & file offsets"""
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a timeframe archive")
+    magic, version, flags, seconds, count = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a timeframe archive")
+    if version != VERSION:
+        raise ValueError(f"{path} has an unsupported version: {version}")
+
+    f.seek(-FOOTER.size, os.SEEK_END)
+    table_offset, chunks = FOOTER.unpack(f.read(FOOTER.size))
+    f.seek(table_offset)
+    table = f.read(chunks * ENTRY.size)
+    if len(table) != chunks * ENTRY.size:
+        raise ValueError(f"{path} is truncated")
+
+    entries = list(ENTRY.iter_unpack(table))
+    first_starts = [first_start for first_start, _ in entries]
+    # every chunk ends where the next one begins, the last one at the table
+    offsets = [offset for _, offset in entries] + [table_offset]
+    return count, _tz_of(flags, seconds), first_starts, offsets
+
+
+def iter_load(
+    path: Union[str, os.PathLike], start: Optional[datetime] = None
+) -> Iterator[TimeFrame]:
+    """Decode an archive lazily, one chunk at a time
+
+    Given `start`, decoding begins at the chunk holding it & skips whatever
+    ends before it, i.e. the first timeframe is either the one containing
+    `start` or the first one after it.
+    """
+    if start is not None and not isinstance(start, datetime):
+        raise TypeError(f"{start} should be a datetime")
+
+    with open(path, "rb") as f:
+        _, tz, first_starts, offsets = _read_table(f, path)
+
+        chunk, lower = 0, None
+        if start is not None:
+            if first_starts:
+                _check_aware(tz is not None, _is_aware(start))
+            lower = _to_us(start)
+            chunk = max(bisect_right(first_starts, lower) - 1, 0)
+
+        for index in range(chunk, len(first_starts)):
+            f.seek(offsets[index])
+            values = _varints(f.read(offsets[index + 1] - offsets[index]))
+            previous = first_starts[index] - 1
+            for gap, length in zip(values, values):
+                frame_start = previous + gap + 1
+                previous = frame_start + length
+                if lower is not None and previous < lower:
+                    continue
+                yield TimeFrame._from_us(frame_start, previous, tz)
+            lower = None  # only the first chunk might start too early
+
+
+def load(path: Union[str, os.PathLike]) -> BatchTimeFrame:
+    """Decode a whole archive into a batch"""
+    return BatchTimeFrame._from_normalized(list(iter_load(path)))
@@ -0,0 +1,495 @@
+import warnings
+from datetime import datetime, timedelta, tzinfo
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import timeframe as core
+from .timeframe import (
+    INCLUDES_DEPRECATION_WARNING,
+    BaseTimeFrame,
+    BatchTimeFrame,
+    TimeFrame,
+    _buckets,
+    _check_all_aware,
+    _check_aware,
+    _datetime_of,
+    _Empty,
+    _is_aware,
+    _to_us,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+NUMPY_REQUIRED_ERROR = (
+    "numpy is required for ArrayBatchTimeFrame, install it with"
+    " `pip install timeframe[numpy]`"
+)
+
+
+def _require_numpy():
+    if np is None:  # pragma: no cover
+        raise ImportError(NUMPY_REQUIRED_ERROR)
+
+
+def _pairs(starts, ends, other_starts, other_ends) -> Tuple["np.ndarray", ...]:
+    """Index the pairs that overlap or touch across two sorted & disjoint sets"""
+    lower = np.searchsorted(other_ends, starts, "left")
+    upper = np.searchsorted(other_starts, ends, "right")
+    counts = np.maximum(upper - lower, 0)
+    core._count(int(counts.sum()))
+    # a flat `range(lower, upper)` for every element of the first set
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.arange(len(starts)), counts), np.repeat(lower, counts) + offsets
+
+
+def _as_points(dts, aware: Optional[bool] = None) -> "np.ndarray":
+    """Microseconds out of `datetime64`, integers, or any iterable of datetimes
+
+    The datetimes must be as aware as `aware`, the rest are taken as is.
+    """
+    _require_numpy()
+
+    if hasattr(dts, "__array__"):
+        dts = np.asarray(dts)
+        if dts.dtype.kind in "Miu":
+            return ArrayBatchTimeFrame._as_us(dts)
+
+    points = []
+    for dt in dts:
+        if not isinstance(dt, datetime):
+            raise TypeError(f"{dt} should be a datetime")
+        _check_aware(aware, _is_aware(dt))
+        points.append(_to_us(dt))
+    return np.array(points, np.int64)
+
+
+def _locate(starts, ends, points) -> "np.ndarray":
+    """The index of the timeframe containing each point, or -1 if none does"""
+    if not len(starts):
+        return np.full(len(points), -1, np.intp)
+
+    index = np.searchsorted(starts, points, "right") - 1
+    found = (index >= 0) & (points <= ends[np.maximum(index, 0)])
+    return np.where(found, index, -1)
+
+
+def _locate_sorted(frames, points) -> "np.ndarray":
+    """`_locate` over the chunks of a `_SortedFrames`, only reading the ones hit"""
+    result = np.full(len(points), -1, np.intp)
+    if not len(frames) or not len(points):
+        return result
+
+    chunks = np.searchsorted(np.array(frames._mins, np.int64), points, "right") - 1
+    order = np.argsort(chunks, kind="stable")
+    hit, lowers = np.unique(chunks[order], return_index=True)
+    uppers = np.append(lowers[1:], len(points))
+    offsets = frames.offsets()
+    for chunk, lower, upper in zip(hit.tolist(), lowers.tolist(), uppers.tolist()):
+        if chunk < 0:
+            continue  # before the first timeframe
+        taken = order[lower:upper]
+        starts, ends = frames.chunk_columns(chunk)
+        located = _locate(
+            np.array(starts, np.int64), np.array(ends, np.int64), points[taken]
+        )
+        result[taken] = np.where(located >= 0, located + offsets[chunk], -1)
+    return result
+
+
+def _subtract_one(start: int, end: int, starts, ends) -> List[Tuple[int, int]]:
+    """`BatchTimeFrame._subtract` for one timeframe, on plain microseconds"""
+    result = []
+    lower = start
+    for candidate_start, candidate_end in zip(starts.tolist(), ends.tolist()):
+        if candidate_start > end:
+            break
+
+        if candidate_start <= lower and end <= candidate_end:
+            return result  # the remainder is completely covered
+
+        if lower < candidate_start:
+            if candidate_start >= end:
+                continue  # touching on the edge is not an overlap
+            result.append((lower, candidate_start - 1))
+            if candidate_end >= end:
+                return result
+            lower = candidate_end + 1
+        elif lower < candidate_end or lower != start:
+            lower = candidate_end + 1
+
+    result.append((lower, end))
+    return result
+
+
+class ArrayBatchTimeFrame(BaseTimeFrame):
+    """An immutable batch of timeframes stored as two int64 microsecond columns
+
+    It gives the same results as `BatchTimeFrame` at 16 bytes per timeframe,
+    and every operation is vectorized. The timeframes handed out are in the
+    timezone of the first input, or naive if it was naive.
+    """
+
+    __slots__ = ("_starts", "_ends", "_tz")
+
+    def __init__(self, time_frames: Iterable[BaseTimeFrame]):
+        _require_numpy()
+
+        if not isinstance(time_frames, Iterable):
+            raise TypeError(f"{time_frames} should be an iterable")
+
+        time_frames = list(time_frames)
+        if not all(isinstance(tf, (TimeFrame, _Empty)) for tf in time_frames):
+            raise TypeError("Every iterable element should be a BaseTimeFrame")
+
+        time_frames = [tf for tf in time_frames if isinstance(tf, TimeFrame)]
+        _check_all_aware(time_frames)
+        starts = np.fromiter((tf._start_us for tf in time_frames), np.int64)
+        ends = np.fromiter((tf._end_us for tf in time_frames), np.int64)
+        tz = time_frames[0]._tz if time_frames else None
+        self._set(*self._normalize(starts, ends), tz)
+
+    @classmethod
+    def from_arrays(
+        cls, starts, ends, tz: Optional[tzinfo] = None
+    ) -> "ArrayBatchTimeFrame":
+        """Build a batch from `datetime64` arrays or integer microseconds"""
+        _require_numpy()
+
+        starts, ends = cls._as_us(starts), cls._as_us(ends)
+        if starts.shape != ends.shape or starts.ndim != 1:
+            raise ValueError("starts & ends should be 1-d arrays of the same length")
+        if (starts > ends).any():
+            raise ValueError("start should be lower or equal than end")
+
+        return cls._from_columns(*cls._normalize(starts, ends), tz)
+
+    @staticmethod
+    def _as_us(values) -> "np.ndarray":
+        values = np.asarray(values)
+        if values.dtype.kind == "M":
+            return values.astype("datetime64[us]").view(np.int64)
+        if values.dtype.kind in "iu":
+            return values.astype(np.int64)
+        raise TypeError(f"{values.dtype} should be either datetime64 or integer")
+
+    @classmethod
+    def _from_columns(cls, starts, ends, tz: Optional[tzinfo]) -> "ArrayBatchTimeFrame":
+        """Wrap already sorted & disjoint columns, skipping normalization"""
+        btf = cls.__new__(cls)
+        btf._set(starts, ends, tz)
+        return btf
+
+    def _set(self, starts, ends, tz: Optional[tzinfo]):
+        # the columns are shared between batches, they must never be written to
+        starts.flags.writeable = False
+        ends.flags.writeable = False
+        self._starts, self._ends, self._tz = starts, ends, tz
+
+    @staticmethod
+    def _normalize(starts, ends) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Coalesce overlapping & adjacent timeframes, `BatchTimeFrame` style"""
+        if not len(starts):
+            return starts, ends
+
+        order = np.lexsort((ends, starts))
+        starts, ends = starts[order], ends[order]
+        # the latest end so far decides whether the next one is a new run
+        reach = np.maximum.accumulate(ends)
+        heads = np.flatnonzero(starts[1:] > reach[:-1]) + 1
+        tails = np.append(heads - 1, len(starts) - 1)
+        return starts[np.insert(heads, 0, 0)], reach[tails]
+
+    @staticmethod
+    def _columns(tf: BaseTimeFrame) -> Tuple["np.ndarray", "np.ndarray"]:
+        """The sorted & disjoint columns of any kind of timeframe"""
+        if isinstance(tf, ArrayBatchTimeFrame):
+            return tf._starts, tf._ends
+        if isinstance(tf, TimeFrame):
+            return (
+                np.array([tf._start_us], np.int64),
+                np.array([tf._end_us], np.int64),
+            )
+        if isinstance(tf, _Empty):
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        # any other batch, e.g. a `BatchTimeFrame`
+        return (
+            np.fromiter((frame._start_us for frame in tf), np.int64),
+            np.fromiter((frame._end_us for frame in tf), np.int64),
+        )
+
+    @property
+    def starts_us(self) -> "np.ndarray":
+        """The starts in microseconds since the epoch, as a read-only array"""
+        return self._starts
+
+    @property
+    def ends_us(self) -> "np.ndarray":
+        """The ends in microseconds since the epoch, as a read-only array"""
+        return self._ends
+
+    def __iter__(self) -> Iterator[TimeFrame]:
+        tz = self._tz
+        for start, end in zip(self._starts.tolist(), self._ends.tolist()):
+            yield TimeFrame._from_us(start, end, tz)
+
+    @property
+    def time_frames(self) -> List[TimeFrame]:
+        return list(self)
+
+    @property
+    def len_timeframes(self) -> int:
+        return len(self._starts)
+
+    def to_batch(self) -> BatchTimeFrame:
+        return BatchTimeFrame._from_normalized(self.time_frames)
+
+    @property
+    def duration(self) -> float:
+        return self.duration_us / 1_000_000
+
+    @property
+    def duration_us(self) -> int:
+        """The exact duration in microseconds, free of float rounding"""
+        return int((self._ends - self._starts).sum())
+
+    @property
+    def _aware(self) -> Optional[bool]:
+        """Whether the timeframes are aware, or None if there's none"""
+        return None if not len(self._starts) else self._tz is not None
+
+    @property
+    def start(self) -> Optional[datetime]:
+        """The earliest start, or None when the batch is empty"""
+        if not len(self._starts):
+            return None
+        return _datetime_of(int(self._starts[0]), self._tz)
+
+    @property
+    def end(self) -> Optional[datetime]:
+        """The latest end, or None when the batch is empty"""
+        if not len(self._ends):
+            return None
+        return _datetime_of(int(self._ends[-1]), self._tz)
+
+    def __eq__(self, tf: BaseTimeFrame) -> bool:
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        if isinstance(tf, TimeFrame) and not len(self._starts):
+            return True  # the same as `TimeFrame.__eq__` on an empty batch
+        if len(self._starts) and tf._aware not in (None, self._aware):
+            return False  # naive & aware are never equal
+
+        starts, ends = self._columns(tf)
+        return np.array_equal(self._starts, starts) and np.array_equal(self._ends, ends)
+
+    def __repr__(self) -> str:
+        return "\n".join(str(tf) for tf in self)
+
+    def _has_common_ground(self, _: BaseTimeFrame) -> bool:  # pragma: no cover
+        return False
+
+    def _covers(self, starts, ends, strict: bool = False) -> bool:
+        """Whether every one of start-end falls within a single timeframe"""
+        if not len(self._starts):
+            return False
+
+        # the latest start before (or at, unless strict) each of the starts
+        index = np.searchsorted(self._starts, starts, "left" if strict else "right")
+        index -= 1
+        if (index < 0).any():
+            return False
+        if strict:
+            return bool((ends < self._ends[index]).all())
+        return bool((ends <= self._ends[index]).all())
+
+    def __contains__(self, dt: Union[datetime, BaseTimeFrame]) -> bool:
+        if not isinstance(dt, (datetime, BaseTimeFrame)):
+            raise TypeError(f"{dt} should be either a datetime or a BaseTimeFrame")
+
+        if isinstance(dt, datetime):
+            _check_aware(self._aware, _is_aware(dt))
+            us = np.array([_to_us(dt)], np.int64)
+            return self._covers(us, us)
+
+        if isinstance(dt, _Empty):
+            return True  # this is debatable & philosophical rather!
+
+        _check_aware(self._aware, dt._aware)
+        starts, ends = self._columns(dt)
+        return not len(starts) or self._covers(starts, ends)
+
+    def includes(self, tf: BaseTimeFrame) -> bool:
+        warnings.warn(INCLUDES_DEPRECATION_WARNING, DeprecationWarning)
+
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        if isinstance(tf, _Empty):
+            return False
+
+        _check_aware(self._aware, tf._aware)
+        starts, ends = self._columns(tf)
+        return not len(starts) or self._covers(starts, ends, strict=True)
+
+    def locate_many(self, dts: Iterable[datetime]) -> "np.ndarray":
+        """The index of the timeframe containing each datetime, or -1 if none does"""
+        return _locate(self._starts, self._ends, _as_points(dts, self._aware))
+
+    def contains_many(self, dts: Iterable[datetime]) -> "np.ndarray":
+        """A boolean mask of the datetimes that are in the batch"""
+        return self.locate_many(dts) >= 0
+
+    def _with(self, starts, ends) -> "ArrayBatchTimeFrame":
+        return ArrayBatchTimeFrame._from_columns(starts, ends, self._tz)
+
+    def _other(self, tf: BaseTimeFrame) -> Tuple["np.ndarray", "np.ndarray"]:
+        """The columns of the other operand, given that it's as aware as we are"""
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        _check_aware(self._aware, tf._aware)
+        return self._columns(tf)
+
+    def __add__(self, tf: BaseTimeFrame) -> "ArrayBatchTimeFrame":
+        starts, ends = self._other(tf)
+        return self._with(
+            *self._normalize(
+                np.concatenate((self._starts, starts)),
+                np.concatenate((self._ends, ends)),
+            )
+        )
+
+    __radd__ = __add__
+
+    def __mul__(self, tf: BaseTimeFrame) -> "ArrayBatchTimeFrame":
+        starts, ends = self._other(tf)
+        left, right = _pairs(self._starts, self._ends, starts, ends)
+        start1, end1 = self._starts[left], self._ends[left]
+        start2, end2 = starts[right], ends[right]
+        # `TimeFrame._has_common_ground`, i.e. an edge inside the other one
+        common = (
+            ((start1 < start2) & (start2 < end1))
+            | ((start1 < end2) & (end2 < end1))
+            | ((start2 < start1) & (start1 < end2))
+            | ((start2 < end1) & (end1 < end2))
+        )
+        return self._with(
+            np.maximum(start1, start2)[common], np.minimum(end1, end2)[common]
+        )
+
+    __rmul__ = __mul__
+
+    def __sub__(self, tf: BaseTimeFrame) -> "ArrayBatchTimeFrame":
+        return self._with(*self._subtract(self._starts, self._ends, *self._other(tf)))
+
+    def __rsub__(self, tf: BaseTimeFrame) -> "ArrayBatchTimeFrame":
+        starts, ends = self._other(tf)
+        return self._with(*self._subtract(starts, ends, self._starts, self._ends))
+
+    def gaps(self, within: Optional[TimeFrame] = None) -> "ArrayBatchTimeFrame":
+        """The time within the bounds not covered by any timeframe, `within - self`
+
+        The bounds default to the span of the batch, i.e. the gaps in between
+        its timeframes.
+        """
+        if within is None:
+            if not len(self._starts):
+                return self
+            within = TimeFrame._from_us(int(self._starts[0]), int(self._ends[-1]))
+
+        if isinstance(within, _Empty):
+            return self._with(np.empty(0, np.int64), np.empty(0, np.int64))
+        if not isinstance(within, TimeFrame):
+            raise TypeError(f"{within} should be a TimeFrame")
+
+        # only the timeframes overlapping or touching the bounds matter
+        lower = np.searchsorted(self._ends, within._start_us, "left")
+        upper = np.searchsorted(self._starts, within._end_us, "right")
+        starts, ends = self._other(within)
+        return self._with(
+            *self._subtract(
+                starts, ends, self._starts[lower:upper], self._ends[lower:upper]
+            )
+        )
+
+    def complement(self, within: TimeFrame) -> "ArrayBatchTimeFrame":
+        """The time within the bounds not covered by any timeframe, see `gaps`"""
+        return self.gaps(within)
+
+    def histogram(
+        self,
+        freq: timedelta,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> "np.ndarray":
+        """`BatchTimeFrame.histogram`, vectorized
+
+        The time covered before each bucket edge is the total duration of the
+        timeframes starting before it, less whatever the last of them overhangs.
+        """
+        lower, upper, step = _buckets(self, freq, start, end)
+        count = -(-(upper - lower) // step)
+        if not len(self._starts):
+            return np.zeros(count)
+
+        edges = np.minimum(lower + step * np.arange(count + 1, dtype=np.int64), upper)
+        totals = np.concatenate(([0], np.cumsum(self._ends - self._starts)))
+        before = np.searchsorted(self._starts, edges, "left")
+        overhang = np.maximum(self._ends[np.maximum(before - 1, 0)] - edges, 0)
+        covered = totals[before] - np.where(before > 0, overhang, 0)
+        return np.diff(covered) / 1_000_000
+
+    @staticmethod
+    def _subtract(starts, ends, candidate_starts, candidate_ends):
+        """`BatchTimeFrame._subtract`, vectorized
+
+        On the microsecond grid, removing a candidate along with one microsecond
+        on each side is a plain set difference, i.e. an intersection with the
+        gaps between the candidates. The only exception is a candidate touching
+        a timeframe on its edge, which is left alone; the timeframes where that
+        might happen are rare, so they go through the sequential sweep.
+        """
+        if not len(candidate_starts) or not len(starts):
+            return starts, ends
+
+        limits = np.iinfo(np.int64)
+        gap_starts = np.append(limits.min, candidate_ends + 1)
+        gap_ends = np.append(candidate_starts - 1, limits.max)
+        valid = gap_starts <= gap_ends
+        gap_starts, gap_ends = gap_starts[valid], gap_ends[valid]
+
+        owners, gaps = _pairs(starts, ends, gap_starts, gap_ends)
+        result_starts = np.maximum(starts[owners], gap_starts[gaps])
+        result_ends = np.minimum(ends[owners], gap_ends[gaps])
+
+        count = len(candidate_starts)
+        lower = np.searchsorted(candidate_ends, starts, "left")
+        upper = np.searchsorted(candidate_starts, ends, "right")
+        touches_start = candidate_ends[np.minimum(lower, count - 1)] == starts
+        touches_start &= lower < count
+        touches_end = candidate_starts[np.maximum(upper - 1, 0)] == ends
+        touches_end &= upper > 0
+        edgy = np.flatnonzero(touches_start | touches_end)
+        if not len(edgy):
+            return result_starts, result_ends
+
+        keep = ~np.isin(owners, edgy)
+        pieces = [
+            piece
+            for index in edgy.tolist()
+            for piece in _subtract_one(
+                int(starts[index]),
+                int(ends[index]),
+                candidate_starts[lower[index] : upper[index]],
+                candidate_ends[lower[index] : upper[index]],
+            )
+        ]
+        result_starts = np.append(result_starts[keep], [p[0] for p in pieces])
+        result_ends = np.append(result_ends[keep], [p[1] for p in pieces])
+        order = np.argsort(result_starts, kind="stable")
+        return result_starts[order].astype(np.int64), result_ends[order].astype(
+            np.int64
+        )
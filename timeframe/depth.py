@@ -0,0 +1,204 @@
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, tzinfo
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .timeframe import (
+    BaseTimeFrame,
+    BatchTimeFrame,
+    TimeFrame,
+    _check_aware,
+    _Empty,
+    _is_aware,
+    _to_us,
+)
+
+
+class DepthProfile:
+    """How many timeframes are active at each moment, as a step function
+
+    The depth changes at `times[i]` to `depths[i]` & holds until the next
+    change; it's zero before the first one & after the last one. A timeframe
+    is active from its start to its end, both included, same as `dt in tf`.
+    """
+
+    __slots__ = ("_times", "_depths", "_tz")
+
+    def __init__(self, times: List[int], depths: List[int], tz: Optional[tzinfo]):
+        self._times = times
+        self._depths = depths
+        self._tz = tz
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __iter__(self) -> Iterator[Tuple[TimeFrame, int]]:
+        """The steps with at least one active timeframe, along with the depth"""
+        for index, depth in enumerate(self._depths):
+            if depth:
+                yield self._frame(index, index + 1), depth
+
+    def _frame(self, lower: int, upper: int) -> TimeFrame:
+        """From the start of step `lower` up to right before step `upper`"""
+        return TimeFrame._from_us(self._times[lower], self._times[upper] - 1, self._tz)
+
+    def depth_at(self, dt: datetime) -> int:
+        if not isinstance(dt, datetime):
+            raise TypeError(f"{dt} should be a datetime")
+        if self._times:
+            _check_aware(self._tz is not None, _is_aware(dt))
+
+        index = bisect_right(self._times, _to_us(dt)) - 1
+        return self._depths[index] if index >= 0 else 0
+
+    @property
+    def peak(self) -> int:
+        """The highest number of timeframes active at once"""
+        return max(self._depths, default=0)
+
+    @property
+    def peaks(self) -> BatchTimeFrame:
+        """Whenever the depth is at its peak"""
+        return self.at_least(self.peak) if self._depths else BatchTimeFrame([])
+
+    def at_least(
+        self, depth: int, within: Optional[BaseTimeFrame] = None
+    ) -> BatchTimeFrame:
+        """Whenever at least `depth` timeframes are active at once, within bounds"""
+        if depth < 1:
+            raise ValueError(f"depth should be at least 1: {depth}")
+
+        return self._where(lambda current: current >= depth, within)
+
+    def at_most(
+        self, depth: int, within: Optional[BaseTimeFrame] = None
+    ) -> BatchTimeFrame:
+        """Whenever at most `depth` timeframes are active at once, within bounds
+
+        There's no end to the time with nothing active, so the bounds default
+        to the span of the profile.
+        """
+        if depth < 0:
+            raise ValueError(f"depth should not be negative: {depth}")
+
+        return self._where(lambda current: current <= depth, within)
+
+    def _where(self, predicate, within: Optional[BaseTimeFrame]) -> BatchTimeFrame:
+        """The runs of steps whose depth satisfies `predicate`, clipped to `within`"""
+        times, depths, tz = self._times, self._depths, self._tz
+        if within is None:
+            if not times:
+                return BatchTimeFrame([])
+            lower, upper = times[0], times[-1] - 1
+        elif isinstance(within, TimeFrame):
+            if times:
+                _check_aware(tz is not None, within._aware)
+            lower, upper = within._start_us, within._end_us
+            tz = tz if times else within._tz
+        elif isinstance(within, _Empty):
+            return BatchTimeFrame([])
+        else:
+            raise TypeError(f"{within} should be a TimeFrame")
+
+        # the step holding `lower`, then every change up to `upper`
+        index = bisect_right(times, lower) - 1
+        current = depths[index] if index >= 0 else 0
+        start = lower if predicate(current) else None
+        result = []
+        for index in range(index + 1, bisect_right(times, upper)):
+            if predicate(depths[index]):
+                if start is None:
+                    start = times[index]
+            elif start is not None:
+                result.append(TimeFrame._from_us(start, times[index] - 1, tz))
+                start = None
+        if start is not None:
+            result.append(TimeFrame._from_us(start, upper, tz))
+
+        return BatchTimeFrame._from_normalized(result)
+
+
+def depth_profile(time_frames: Iterable[BaseTimeFrame]) -> DepthProfile:
+    """Sweep over the timeframes, counting how many overlap at each moment
+
+    Timeframes are counted as given, overlapping or not; it costs O(n log n).
+    """
+    if not isinstance(time_frames, Iterable):
+        raise TypeError(f"{time_frames} should be an iterable")
+
+    # a timeframe ends right after its last microsecond, as it's closed
+    deltas = defaultdict(int)
+    tz = None
+    for tf in time_frames:
+        if isinstance(tf, _Empty):
+            continue
+        if not isinstance(tf, TimeFrame):
+            raise TypeError(f"{tf} should be a TimeFrame")
+        if not deltas:
+            tz = tf._tz
+        elif (tz is not None) != tf._aware:
+            _check_aware(tz is not None, tf._aware)
+        deltas[tf._start_us] += 1
+        deltas[tf._end_us + 1] -= 1
+
+    times, depths = [], []
+    depth = 0
+    for time in sorted(deltas):
+        delta = deltas[time]
+        if delta:
+            depth += delta
+            times.append(time)
+            depths.append(depth)
+
+    return DepthProfile(times, depths, tz)
+
+
+def _calendar(source) -> Iterable[TimeFrame]:
+    """The timeframes of a source, coalesced so that it counts once at most"""
+    if isinstance(source, TimeFrame):
+        return [source]
+    if isinstance(source, _Empty):
+        return []
+    if isinstance(source, BaseTimeFrame):
+        return source  # batches are normalized already
+    if isinstance(source, Iterable):
+        return BatchTimeFrame(source)
+    raise TypeError(f"{source} should be either a BaseTimeFrame or an iterable")
+
+
+def _quorum_profile(sources: Iterable[Iterable[BaseTimeFrame]]) -> DepthProfile:
+    """How many of the sources are active at each moment
+
+    Unlike `depth_profile`, the timeframes of each source are coalesced first,
+    so that overlapping ones within the same source count once.
+    """
+    if not isinstance(sources, Iterable):
+        raise TypeError(f"{sources} should be an iterable")
+
+    return depth_profile(chain.from_iterable(map(_calendar, sources)))
+
+
+def at_least(
+    sources: Iterable[Iterable[BaseTimeFrame]],
+    k: int,
+    within: Optional[BaseTimeFrame] = None,
+) -> BatchTimeFrame:
+    """Whenever at least `k` of the sources are active, in one O(N log N) sweep
+
+    It's moment by moment, so timeframes touching on the edge are both active
+    at that moment, unlike `*`.
+    """
+    return _quorum_profile(sources).at_least(k, within)
+
+
+def at_most(
+    sources: Iterable[Iterable[BaseTimeFrame]],
+    k: int,
+    within: Optional[BaseTimeFrame] = None,
+) -> BatchTimeFrame:
+    """Whenever at most `k` of the sources are active, see `at_least`
+
+    The bounds default to the span of all the sources.
+    """
+    return _quorum_profile(sources).at_most(k, within)
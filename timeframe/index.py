@@ -0,0 +1,249 @@
+import random
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from .timeframe import TimeFrame, _check_all_aware, _check_aware, _is_aware, _to_us
+
+# the treap priorities, drawn apart from the global generator callers may seed
+_rng = random.Random()
+
+
+class _Node:
+    __slots__ = ("key", "tf", "payload", "priority", "left", "right", "max_end")
+
+    def __init__(self, key: Tuple[int, int, int], tf: TimeFrame, payload: Any):
+        self.key = key
+        self.tf = tf
+        self.payload = payload
+        self.priority = _rng.random()
+        self.left = None
+        self.right = None
+        self.max_end = key[1]
+
+    def update(self):
+        max_end = self.key[1]
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _rotate_right(node: _Node) -> _Node:
+    pivot = node.left
+    node.left, pivot.right = pivot.right, node
+    node.update()
+    pivot.update()
+    return pivot
+
+
+def _rotate_left(node: _Node) -> _Node:
+    pivot = node.right
+    node.right, pivot.left = pivot.left, node
+    node.update()
+    pivot.update()
+    return pivot
+
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    if node is None:
+        return new
+
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            return _rotate_right(node)
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            return _rotate_left(node)
+
+    node.update()
+    return node
+
+
+def _join(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Join two treaps, every key of `left` being lower than those of `right`"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.priority > right.priority:
+        left.right = _join(left.right, right)
+        left.update()
+        return left
+
+    right.left = _join(left, right.left)
+    right.update()
+    return right
+
+
+def _delete(node: Optional[_Node], key: Tuple[int, int, int]) -> Optional[_Node]:
+    if node is None:  # pragma: no cover
+        return None
+
+    if key == node.key:
+        return _join(node.left, node.right)
+
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+
+    node.update()
+    return node
+
+
+class IntervalIndex:
+    """Raw timeframes, with an optional payload each, for stabbing & overlap queries
+
+    Unlike a batch, nothing is merged, so every timeframe keeps its identity.
+    It's a treap keyed on the starts where every node knows the latest end
+    below it, hence the queries skip whatever ends too early & cost
+    O(log n + k), while `add` & `discard` cost O(log n) on average.
+    """
+
+    __slots__ = ("_root", "_len", "_seq")
+
+    def __init__(
+        self, time_frames: Iterable[TimeFrame] = (), payloads: Optional[Iterable] = None
+    ):
+        if not isinstance(time_frames, Iterable):
+            raise TypeError(f"{time_frames} should be an iterable")
+
+        time_frames = list(time_frames)
+        if not all(isinstance(tf, TimeFrame) for tf in time_frames):
+            raise TypeError("Every iterable element should be a TimeFrame")
+        _check_all_aware(time_frames)
+
+        payloads = [None] * len(time_frames) if payloads is None else list(payloads)
+        if len(payloads) != len(time_frames):
+            raise ValueError("there should be exactly one payload per timeframe")
+
+        nodes = sorted(
+            (
+                _Node((tf._start_us, tf._end_us, seq), tf, payload)
+                for seq, (tf, payload) in enumerate(zip(time_frames, payloads))
+            ),
+            key=lambda node: node.key,
+        )
+        self._root = self._build(nodes)
+        self._len = len(nodes)
+        self._seq = len(nodes)
+
+    @staticmethod
+    def _build(nodes: List[_Node]) -> Optional[_Node]:
+        """Build the treap out of sorted nodes in linear time"""
+        # the right spine of the tree so far; whatever leaves it is complete
+        spine = []
+        for node in nodes:
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+                last.update()
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+
+        for node in reversed(spine):
+            node.update()
+        return spine[0] if spine else None
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def _aware(self) -> Optional[bool]:
+        """Whether the timeframes are aware, or None if there's none"""
+        return None if self._root is None else self._root.tf._aware
+
+    def __iter__(self) -> Iterator[Tuple[TimeFrame, Any]]:
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.tf, node.payload
+            node = node.right
+
+    def add(self, tf: TimeFrame, payload: Any = None):
+        if not isinstance(tf, TimeFrame):
+            raise TypeError(f"{tf} should be a TimeFrame")
+
+        _check_aware(self._aware, tf._aware)
+        node = _Node((tf._start_us, tf._end_us, self._seq), tf, payload)
+        self._root = _insert(self._root, node)
+        self._seq += 1
+        self._len += 1
+
+    def discard(self, tf: TimeFrame, payload: Any = None):
+        """Remove one occurrence of `tf` along with `payload`, if there is one"""
+        if not isinstance(tf, TimeFrame):
+            raise TypeError(f"{tf} should be a TimeFrame")
+
+        node = self._find(tf._start_us, tf._end_us, payload)
+        if node is not None:
+            self._root = _delete(self._root, node.key)
+            self._len -= 1
+
+    def _find(self, start: int, end: int, payload: Any) -> Optional[_Node]:
+        lower = (start, end)
+        stack, node = [], self._root
+        # an in-order walk over the keys starting with `lower`
+        while stack or node is not None:
+            while node is not None:
+                if node.key < lower:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return None
+            node = stack.pop()
+            if node.key[:2] != lower:
+                return None
+            if node.payload == payload:
+                return node
+            node = node.right
+        return None
+
+    def _touching(self, start: int, end: int) -> Iterator[_Node]:
+        """The nodes overlapping or touching start-end, sorted by start"""
+        stack, node = [], self._root
+        while stack or node is not None:
+            # nothing below a node ending before `start` can reach it
+            while node is not None and node.max_end >= start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key[0] > end:
+                return
+            if node.key[1] >= start:
+                yield node
+            node = node.right
+
+    def stab(self, dt: datetime) -> List[Tuple[TimeFrame, Any]]:
+        """The timeframes containing `dt`, i.e. the ones with `dt in tf`"""
+        if not isinstance(dt, datetime):
+            raise TypeError(f"{dt} should be a datetime")
+
+        _check_aware(self._aware, _is_aware(dt))
+        us = _to_us(dt)
+        return [(node.tf, node.payload) for node in self._touching(us, us)]
+
+    def overlap(self, tf: TimeFrame) -> List[Tuple[TimeFrame, Any]]:
+        """The timeframes having common ground with `tf`, the same as `tf * x`"""
+        if not isinstance(tf, TimeFrame):
+            raise TypeError(f"{tf} should be a TimeFrame")
+
+        _check_aware(self._aware, tf._aware)
+        return [
+            (node.tf, node.payload)
+            for node in self._touching(tf._start_us, tf._end_us)
+            if tf._has_common_ground(node.tf)
+        ]
@@ -0,0 +1,118 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import Iterable, List, Sequence, Tuple
+
+from . import timeframe as core
+from .timeframe import BaseTimeFrame, BatchTimeFrame, TimeFrame, _check_all_aware
+
+# below this many timeframes per worker, the pool costs more than it saves
+MIN_PARTITION = 10_000
+# the number of starts sampled per partition to pick the boundaries
+_SAMPLES = 32
+# the bounds of the first & the last partitions, beyond any int64
+_LOWEST, _HIGHEST = -(2**63), 2**63
+
+
+def _boundaries(starts: Sequence[int], partitions: int) -> List[int]:
+    """Split points for about as many timeframes per partition, out of a sample"""
+    step = max(len(starts) // (partitions * _SAMPLES), 1)
+    sample = sorted(islice(starts, 0, None, step))
+    bounds = {
+        sample[len(sample) * index // partitions] for index in range(1, partitions)
+    }
+    return sorted(bounds)
+
+
+def _normalize_part(payload: Tuple[int, int, array, array]) -> Tuple[array, array]:
+    """`BatchTimeFrame._normalize` on the timeframes starting in lower-upper
+
+    Every worker gets all the columns & picks its own partition out of them,
+    so that the parent doesn't have to. Every run is handed back as the index
+    of the timeframe it starts with & the one it ends with.
+    """
+    lower, upper, starts, ends = payload
+    heads, tails = array("q"), array("q")
+    indices = [index for index, start in enumerate(starts) if lower <= start < upper]
+    if not indices:
+        return heads, tails
+
+    # by start then by end, as two stable sorts are cheaper than a tuple key
+    indices.sort(key=ends.__getitem__)
+    indices.sort(key=starts.__getitem__)
+    head = tail = indices[0]
+    end = ends[head]
+    for index in islice(indices, 1, None):
+        if starts[index] <= end:
+            if ends[index] > end:
+                end, tail = ends[index], index
+            continue
+
+        heads.append(head)
+        tails.append(tail)
+        head = tail = index
+        end = ends[index]
+
+    heads.append(head)
+    tails.append(tail)
+    return heads, tails
+
+
+def build(time_frames: Iterable[BaseTimeFrame], workers: int) -> BatchTimeFrame:
+    """`BatchTimeFrame(time_frames)`, sorting & merging on `workers` processes
+
+    The timeline is split into partitions holding about as many starts each,
+    every worker normalizes one of them, then the runs crossing a boundary
+    are merged. Only the microseconds go through the pool, packed into
+    `array`s, and the runs come back as the positions of their first & last
+    timeframes; the timeframes are put back together from the originals, a
+    whole partition at a time.
+    """
+    if not isinstance(time_frames, Iterable):
+        raise TypeError(f"{time_frames} should be an iterable")
+    if workers < 1:
+        raise ValueError(f"workers should be at least 1: {workers}")
+
+    time_frames = list(time_frames)
+    if not all(map(BatchTimeFrame._is_timeframe_or_empty, time_frames)):
+        raise TypeError("Every iterable element should be a BaseTimeFrame")
+    time_frames = [tf for tf in time_frames if isinstance(tf, TimeFrame)]
+    _check_all_aware(time_frames)
+
+    partitions = min(workers, len(time_frames) // MIN_PARTITION)
+    if partitions < 2:
+        return BatchTimeFrame(time_frames)
+
+    # a list first, as an array is quicker to build out of one than lazily
+    starts = array("q", [tf._start_us for tf in time_frames])
+    ends = array("q", [tf._end_us for tf in time_frames])
+    bounds = _boundaries(starts, partitions)
+    payloads = zip(
+        [_LOWEST, *bounds], [*bounds, _HIGHEST], repeat(starts), repeat(ends)
+    )
+
+    with ProcessPoolExecutor(partitions) as pool:
+        parts = list(pool.map(_normalize_part, payloads))
+    core._count(len(time_frames) - len(parts))
+
+    # the partitions are in order, only the runs starting within the last one
+    # so far can overlap with it, and they're merged into it
+    result = []
+    end = None
+    for heads, tails in parts:
+        merged = 0
+        while result and merged < len(heads) and starts[heads[merged]] <= end:
+            if ends[tails[merged]] > end:
+                end = ends[tails[merged]]
+                result[-1] = TimeFrame._span(result[-1], time_frames[tails[merged]])
+            merged += 1
+        result.extend(
+            time_frames[head]
+            if head == tail
+            else TimeFrame._span(time_frames[head], time_frames[tail])
+            for head, tail in zip(heads[merged:], tails[merged:])
+        )
+        if len(tails) > merged:
+            end = ends[tails[-1]]
+
+    return BatchTimeFrame._from_normalized(result)
@@ -0,0 +1,238 @@
+import functools
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Sized
+
+from . import timeframe as core
+
+# the operations reported to the hooks, by the module & the class defining them,
+# or by the module alone for its functions; they're only looked up once a hook
+# is added, so that importing this module doesn't import numpy & co.
+_OPERATIONS = {
+    ("timeframe", "TimeFrame"): ("__add__", "__mul__", "__sub__"),
+    ("timeframe", "BatchTimeFrame"): (
+        "__init__",
+        "from_frames",
+        "from_iterable",
+        "union_all",
+        "intersect_all",
+        "add",
+        "discard",
+        "__add__",
+        "__iadd__",
+        "__mul__",
+        "__imul__",
+        "__sub__",
+        "__isub__",
+        "gaps",
+        "complement",
+        "find_slot",
+        "histogram",
+        "__contains__",
+        "locate_many",
+        "contains_many",
+    ),
+    ("array", "ArrayBatchTimeFrame"): (
+        "__init__",
+        "from_arrays",
+        "__add__",
+        "__mul__",
+        "__sub__",
+        "gaps",
+        "complement",
+        "histogram",
+        "__contains__",
+        "locate_many",
+    ),
+    ("index", "IntervalIndex"): ("__init__", "add", "discard", "stab", "overlap"),
+    ("depth", "DepthProfile"): ("at_least", "at_most"),
+    ("depth", None): ("depth_profile", "at_least", "at_most"),
+}
+
+
+class Event(NamedTuple):
+    """One call of an operation, as handed to the hooks"""
+
+    operation: str
+    input_size: int
+    output_size: int
+    comparisons: int
+    seconds: float
+
+
+_hooks: List[Callable[[Event], None]] = []
+# the original methods, while they are replaced by the instrumented ones
+_originals: Dict[object, Dict[str, object]] = {}
+_lock = threading.Lock()
+
+
+def _size(obj) -> int:
+    """The number of timeframes in `obj`, as far as it can be told"""
+    if isinstance(obj, (bool, type)) or obj is None:
+        return 0
+    if isinstance(obj, (core.TimeFrame, datetime)):
+        return 1
+    try:
+        if isinstance(obj, core.BaseTimeFrame):
+            return obj.len_timeframes
+        if isinstance(obj, Sized) and not isinstance(obj, str):
+            return len(obj)
+    except AttributeError:  # e.g. `self` within `__init__`
+        pass
+    return 0
+
+
+def _instrument(name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    def instrumented(*args, **kwargs):
+        comparisons = core._comparisons.get()
+        input_size = sum(map(_size, args))
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        # in-place operations report the size of what they've changed
+        if result is None or (args and result is args[0]):
+            output_size = _size(args[0]) if args else 0
+        else:
+            output_size = _size(result)
+        event = Event(
+            name,
+            input_size,
+            output_size,
+            core._comparisons.get() - comparisons,
+            seconds,
+        )
+        for hook in list(_hooks):
+            hook(event)
+        return result
+
+    return instrumented
+
+
+def _install():
+    # the functions of a module are re-exported by the package, so they're
+    # replaced there as well
+    package = vars(sys.modules[__package__])
+    for (module, cls), names in _OPERATIONS.items():
+        owner = importlib.import_module(f".{module}", __package__)
+        if cls is not None:
+            owner = getattr(owner, cls)
+        originals = _originals[owner] = {}
+        for name in names:
+            original = owner.__dict__[name]
+            originals[name] = original
+            if isinstance(owner, type):
+                operation = f"{owner.__name__}.{name}"
+            else:
+                operation = name
+            if isinstance(original, classmethod):
+                method = classmethod(_instrument(operation, original.__func__))
+            else:
+                method = _instrument(operation, original)
+            setattr(owner, name, method)
+            if not isinstance(owner, type) and package.get(name) is original:
+                package[name] = method
+
+
+def _uninstall():
+    package = vars(sys.modules[__package__])
+    for owner, originals in _originals.items():
+        for name, original in originals.items():
+            if not isinstance(owner, type) and package.get(name) is vars(owner)[name]:
+                package[name] = original
+            setattr(owner, name, original)
+    _originals.clear()
+
+
+def add_hook(hook: Callable[[Event], None]):
+    """Call `hook` with an `Event` after every operation, until it's removed
+
+    The operations are only instrumented while there's at least one hook, so
+    there's no cost at all otherwise. Nested operations are reported as well,
+    e.g. `BatchTimeFrame.add` within `BatchTimeFrame.__add__`.
+    """
+    with _lock:
+        if not _hooks:
+            _install()
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[Event], None]):
+    with _lock:
+        _hooks.remove(hook)
+        if not _hooks:
+            _uninstall()
+
+
+class OperationStats:
+    __slots__ = ("calls", "input_size", "output_size", "comparisons", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.input_size = 0
+        self.output_size = 0
+        self.comparisons = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Profile:
+    """The totals of every operation called while profiling, by their name"""
+
+    def __init__(self):
+        self.operations: Dict[str, OperationStats] = {}
+
+    def record(self, event: Event):
+        stats = self.operations.get(event.operation)
+        if stats is None:
+            stats = self.operations[event.operation] = OperationStats()
+        stats.calls += 1
+        stats.input_size += event.input_size
+        stats.output_size += event.output_size
+        stats.comparisons += event.comparisons
+        stats.seconds += event.seconds
+
+    def __getitem__(self, operation: str) -> OperationStats:
+        return self.operations[operation]
+
+    def __contains__(self, operation: str) -> bool:
+        return operation in self.operations
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.as_dict() for name, stats in self.operations.items()}
+
+    def __repr__(self) -> str:
+        lines = [
+            f"{'operation':<36} {'calls':>8} {'input':>10} {'output':>10}"
+            f" {'comparisons':>12} {'seconds':>10}"
+        ]
+        by_time = sorted(self.operations.items(), key=lambda item: -item[1].seconds)
+        for name, stats in by_time:
+            lines.append(
+                f"{name:<36} {stats.calls:>8} {stats.input_size:>10}"
+                f" {stats.output_size:>10} {stats.comparisons:>12}"
+                f" {stats.seconds:>10.6f}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """Collect the totals of every operation called within the block
+
+    Timings are inclusive, so nested operations are counted in their callers
+    as well as on their own.
+    """
+    result = Profile()
+    add_hook(result.record)
+    try:
+        yield result
+    finally:
+        remove_hook(result.record)
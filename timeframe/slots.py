@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .timeframe import (
+    _MICROSECOND,
+    BatchTimeFrame,
+    TimeFrame,
+    _check_aware,
+    _is_aware,
+    _to_us,
+)
+
+_DIRECTIONS = ("forward", "backward")
+
+
+def find_slot(
+    btf: BatchTimeFrame,
+    min_duration: timedelta,
+    after: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    direction: str = "forward",
+) -> Optional[TimeFrame]:
+    """See `BatchTimeFrame.find_slot`"""
+    if not isinstance(min_duration, timedelta):
+        raise TypeError(f"{min_duration} should be a timedelta")
+    if min_duration < timedelta(0):
+        raise ValueError(f"min_duration should not be negative: {min_duration}")
+    for bound in (after, before):
+        if bound is not None and not isinstance(bound, datetime):
+            raise TypeError(f"{bound} should be a datetime")
+        if bound is not None:
+            _check_aware(btf._aware, _is_aware(bound))
+    if direction not in _DIRECTIONS:
+        raise ValueError(f"direction should be one of {_DIRECTIONS}: {direction}")
+    if after is not None and before is not None and after > before:
+        raise ValueError("after should be lower or equal than before")
+
+    at_least = min_duration // _MICROSECOND
+    forward = direction == "forward"
+    frames = btf._frames
+
+    if not frames:
+        if after is None or before is None:
+            return None
+        slot = TimeFrame(after, before)
+        return slot if slot.duration_us >= at_least else None
+
+    lower = frames.first._start_us if after is None else _to_us(after)
+    upper = frames.last._end_us if before is None else _to_us(before)
+    if lower > upper:
+        return None
+
+    if lower == upper:
+        # a single moment, free unless a timeframe holds it
+        holder = frames.preceding(lower)
+        if at_least or (holder is not None and lower <= holder._end_us):
+            return None
+        moment = after if after is not None else before
+        return TimeFrame(moment, moment)
+
+    # the timeframes cutting into the bounds, from the first one ending after
+    # `lower` to the last one starting before `upper`; touching on the edge is
+    # not an overlap, the same as `TimeFrame(after, before) - btf`
+    chunk, offset = frames._bisect(lower)
+    if offset and frames._chunks[chunk][offset - 1]._end_us > lower:
+        offset -= 1
+    elif offset == len(frames._chunks[chunk]) and chunk + 1 < len(frames._chunks):
+        chunk, offset = chunk + 1, 0
+    first_at = chunk, offset
+    first = (
+        frames._chunks[chunk][offset] if offset < len(frames._chunks[chunk]) else None
+    )
+    last_chunk, last_offset = frames._bisect(upper - 1)
+    last_at = last_chunk, last_offset - 1
+    last = frames._chunks[last_chunk][last_offset - 1] if last_offset else None
+    cut = first is not None and first._start_us < upper
+
+    def head() -> Optional[TimeFrame]:
+        start = after if after is not None else frames.first.start
+        if not cut:
+            end = before if before is not None else frames.last.end
+        elif first._start_us > lower:
+            end = first.start - _MICROSECOND
+        else:
+            return None
+        slot = TimeFrame(start, end)
+        return slot if slot.duration_us >= at_least else None
+
+    def tail() -> Optional[TimeFrame]:
+        if not cut or last._end_us >= upper:
+            return None
+        if last._end_us + 1 == upper and frames.preceding(upper)._start_us == upper:
+            return None  # the one moment left belongs to the next timeframe
+        end = before if before is not None else frames.last.end
+        slot = TimeFrame(last.end + _MICROSECOND, end)
+        return slot if slot.duration_us >= at_least else None
+
+    def inner() -> Optional[TimeFrame]:
+        if not cut or first_at >= last_at:
+            return None
+        around = frames.gap(first_at, last_at, at_least, forward)
+        if around is None:
+            return None
+        before_gap, after_gap = around
+        return TimeFrame._from_us(
+            before_gap._end_us + 1, after_gap._start_us - 1, before_gap._tz
+        )
+
+    for candidate in (head, inner, tail) if forward else (tail, inner, head):
+        slot = candidate()
+        if slot is not None:
+            return slot
+    return None
@@ -0,0 +1,295 @@
+import mmap as _mmap
+import os
+import struct
+import sys
+import warnings
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone, tzinfo
+from itertools import chain
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .timeframe import (
+    INCLUDES_DEPRECATION_WARNING,
+    BaseTimeFrame,
+    BatchTimeFrame,
+    TimeFrame,
+    _check_aware,
+    _datetime_of,
+    _Empty,
+    _is_aware,
+    _locate_many,
+    _to_us,
+)
+
+# magic, version, flags, utc offset in seconds, timeframes, duration in µs;
+# padded to 32 bytes so that the int64 pairs after it are aligned
+HEADER = struct.Struct("<4sHHiqq4x")
+MAGIC = b"TFRM"
+VERSION = 1
+# the timeframes are aware, in the fixed utc offset of the header
+_AWARE = 1
+
+
+def _columns(tf: BaseTimeFrame) -> Tuple[List[int], List[int]]:
+    """The sorted & disjoint starts & ends of any kind of timeframe"""
+    if isinstance(tf, BatchTimeFrame):
+        return tf._frames.columns()
+    if isinstance(tf, MappedBatchTimeFrame):
+        return tf._starts.tolist(), tf._ends.tolist()
+    if isinstance(tf, TimeFrame):
+        return [tf._start_us], [tf._end_us]
+    if isinstance(tf, _Empty):
+        return [], []
+    time_frames = list(tf)
+    return [frame._start_us for frame in time_frames], [
+        frame._end_us for frame in time_frames
+    ]
+
+
+def _offset_of(tf: BaseTimeFrame) -> Tuple[int, int]:
+    """The flags & the utc offset in seconds to store the timezone of `tf` with"""
+    if isinstance(tf, _Empty):
+        return 0, 0  # nothing to store, as naive as an empty batch
+    start = tf.start
+    offset = start.utcoffset() if isinstance(start, datetime) else None
+    if offset is None:
+        return 0, 0
+    return _AWARE, int(offset.total_seconds())
+
+
+def _tz_of(flags: int, seconds: int) -> Optional[tzinfo]:
+    """The inverse of `_offset_of`"""
+    return timezone(timedelta(seconds=seconds)) if flags & _AWARE else None
+
+
+def _int64s(buffer) -> memoryview:
+    """Native int64s out of little-endian bytes, copied only on big-endian hosts"""
+    if sys.byteorder == "little":
+        return memoryview(buffer).cast("q")
+    values = array("q")
+    values.frombytes(buffer)
+    values.byteswap()
+    return memoryview(values)
+
+
+def save(tf: BaseTimeFrame, path: Union[str, os.PathLike]):
+    """Write a batch as a header followed by little-endian int64 start/end pairs
+
+    The file is replaced atomically, so that processes with the previous one
+    mapped keep on reading it undisturbed. Aware timeframes are stored in the
+    utc offset of the first start, i.e. a fixed offset rather than a zone.
+    """
+    if not isinstance(tf, BaseTimeFrame):
+        raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+    starts, ends = _columns(tf)
+    flags, seconds = _offset_of(tf)
+    duration = sum(ends) - sum(starts)
+
+    pairs = array("q", chain.from_iterable(zip(starts, ends)))
+    if sys.byteorder != "little":
+        pairs.byteswap()
+
+    path = os.fspath(path)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, seconds, len(starts), duration))
+        pairs.tofile(f)
+    os.replace(temporary, path)
+
+
+def _read_header(header: bytes, size: int, path) -> Tuple[int, int, Optional[tzinfo]]:
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a timeframe file")
+
+    magic, version, flags, seconds, count, duration = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a timeframe file")
+    if version != VERSION:
+        raise ValueError(f"{path} has an unsupported version: {version}")
+    if size != HEADER.size + 16 * count:
+        raise ValueError(f"{path} is truncated")
+
+    return count, duration, _tz_of(flags, seconds)
+
+
+def open_batch(
+    path: Union[str, os.PathLike], mmap: bool = True
+) -> Union["MappedBatchTimeFrame", BatchTimeFrame]:
+    """Read a file written by `save`, mapped into memory or loaded at once"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        _, duration, tz = _read_header(f.read(HEADER.size), size, path)
+        if mmap:
+            buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            return MappedBatchTimeFrame(buffer, duration, tz)
+        pairs = _int64s(f.read())
+
+    starts, ends = pairs[0::2].tolist(), pairs[1::2].tolist()
+    return BatchTimeFrame._from_normalized(
+        [TimeFrame._from_us(start, end, tz) for start, end in zip(starts, ends)]
+    )
+
+
+class MappedBatchTimeFrame(BaseTimeFrame):
+    """A read-only batch straight out of a memory-mapped file, see `save`
+
+    Opening it costs the same whatever the size: membership & the bisect
+    queries read the mapped pairs in place, the duration comes from the header,
+    and a `TimeFrame` is only created for the ones handed out. The set algebra
+    goes through a regular `BatchTimeFrame`, see `to_batch`.
+    """
+
+    __slots__ = ("_mmap", "_pairs", "_starts", "_ends", "_duration", "_tz")
+
+    def __init__(self, buffer, duration: int, tz: Optional[tzinfo]):
+        self._mmap = buffer
+        self._pairs = _int64s(memoryview(buffer)[HEADER.size :])
+        self._starts = self._pairs[0::2]
+        self._ends = self._pairs[1::2]
+        self._duration = duration
+        self._tz = tz
+
+    def close(self):
+        """Unmap the file; the batch can't be used anymore afterwards"""
+        for view in (self._starts, self._ends, self._pairs):
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedBatchTimeFrame":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __iter__(self) -> Iterator[TimeFrame]:
+        tz = self._tz
+        for start, end in zip(self._starts, self._ends):
+            yield TimeFrame._from_us(start, end, tz)
+
+    @property
+    def time_frames(self) -> List[TimeFrame]:
+        return list(self)
+
+    @property
+    def len_timeframes(self) -> int:
+        return len(self._starts)
+
+    def to_batch(self) -> BatchTimeFrame:
+        return BatchTimeFrame._from_normalized(self.time_frames)
+
+    def save(self, path: Union[str, os.PathLike]):
+        save(self, path)
+
+    @property
+    def duration(self) -> float:
+        return self.duration_us / 1_000_000
+
+    @property
+    def duration_us(self) -> int:
+        """The exact duration in microseconds, free of float rounding"""
+        return self._duration
+
+    @property
+    def _aware(self) -> Optional[bool]:
+        """Whether the timeframes are aware, or None if there's none"""
+        return None if not len(self._starts) else self._tz is not None
+
+    @property
+    def start(self) -> Optional[datetime]:
+        """The earliest start, or None when the batch is empty"""
+        if not len(self._starts):
+            return None
+        return _datetime_of(self._starts[0], self._tz)
+
+    @property
+    def end(self) -> Optional[datetime]:
+        """The latest end, or None when the batch is empty"""
+        if not len(self._ends):
+            return None
+        return _datetime_of(self._ends[-1], self._tz)
+
+    def __eq__(self, tf: BaseTimeFrame) -> bool:
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        if isinstance(tf, TimeFrame) and not len(self._starts):
+            return True  # the same as `TimeFrame.__eq__` on an empty batch
+
+        starts, ends = _columns(tf)
+        return self._starts.tolist() == starts and self._ends.tolist() == ends
+
+    def __repr__(self) -> str:
+        return "\n".join(str(tf) for tf in self)
+
+    def _has_common_ground(self, _: BaseTimeFrame) -> bool:  # pragma: no cover
+        return False
+
+    def _covers(self, start: int, end: int, strict: bool = False) -> bool:
+        """Whether start-end falls within a single timeframe"""
+        bisect = bisect_left if strict else bisect_right
+        index = bisect(self._starts, start) - 1
+        if index < 0:
+            return False
+        return end < self._ends[index] if strict else end <= self._ends[index]
+
+    def __contains__(self, dt: Union[datetime, BaseTimeFrame]) -> bool:
+        if not isinstance(dt, (datetime, BaseTimeFrame)):
+            raise TypeError(f"{dt} should be either a datetime or a BaseTimeFrame")
+
+        if isinstance(dt, datetime):
+            _check_aware(self._aware, _is_aware(dt))
+            us = _to_us(dt)
+            return self._covers(us, us)
+
+        if isinstance(dt, _Empty):
+            return True  # this is debatable & philosophical rather!
+
+        _check_aware(self._aware, dt._aware)
+        return all(map(self._covers, *_columns(dt)))
+
+    def includes(self, tf: BaseTimeFrame) -> bool:
+        warnings.warn(INCLUDES_DEPRECATION_WARNING, DeprecationWarning)
+
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        if isinstance(tf, _Empty):
+            return False
+
+        _check_aware(self._aware, tf._aware)
+        starts, ends = _columns(tf)
+        return all(map(self._covers, starts, ends, [True] * len(starts)))
+
+    def locate_many(self, dts):
+        """The index of the timeframe containing each datetime, or -1 if none does
+
+        An array of `datetime64` (or of datetimes) gets a numpy array back.
+        """
+        return _locate_many(self._starts, self._ends, dts, self._aware)
+
+    def contains_many(self, dts):
+        """Whether each datetime is in the batch, i.e. `[dt in self for dt in dts]`"""
+        located = self.locate_many(dts)
+        if isinstance(located, list):
+            return [index >= 0 for index in located]
+        return located >= 0
+
+    def __add__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
+        return self.to_batch() + tf
+
+    def __radd__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
+        return tf + self.to_batch()
+
+    def __mul__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
+        return self.to_batch() * tf
+
+    def __rmul__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
+        return tf * self.to_batch()
+
+    def __sub__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
+        return self.to_batch() - tf
+
+    def __rsub__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
+        return tf - self.to_batch()
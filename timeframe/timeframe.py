@@ -1,20 +1,116 @@
 import abc
+import heapq
+import os
 import warnings
-from datetime import datetime, timedelta
-from functools import reduce
-from typing import Iterable, Union
+from bisect import bisect_left, bisect_right
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone, tzinfo
+from itertools import accumulate, chain
+from operator import attrgetter, sub
+from typing import (
+    AsyncIterable,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 INCLUDES_DEPRECATION_WARNING = (
     "includes is deprecated, please use the `in` operator instead"
 )
 
+# a total order on timeframes; the rich comparisons of `TimeFrame` are not one
+_SORT_KEY = attrgetter("_start_us", "_end_us")
+# sorted streams only need to agree on the starts to be merged
+_START_KEY = attrgetter("_start_us")
+_END_KEY = attrgetter("_end_us")
+# the gap left on each side of a subtracted timeframe
+_MICROSECOND = timedelta(microseconds=1)
+# naive datetimes are counted from the naive epoch, i.e. they're taken as UTC,
+# which is why they're never compared with aware ones, see `_check_aware`
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# the number of timeframes per chunk of a batch, see `_SortedFrames`
+_LOAD = 1000
+# the storages a batch can be built on, see `BatchTimeFrame.from_frames`
+_BACKENDS = ("python", "numpy", "auto")
+# the pairs of timeframes compared by the sweeps, see `profiling`; it's only
+# ever bumped once per sweep so that it costs nothing when nobody's looking,
+# and it's a context variable so that each thread (& task) counts its own
+_comparisons = ContextVar("comparisons", default=0)
+
+
+def _count(comparisons: int):
+    """Add to the comparisons of the current context, see `_comparisons`"""
+    _comparisons.set(_comparisons.get() + comparisons)
+
+
+def _to_us(dt: datetime) -> int:
+    """Return the microseconds since the epoch, the internal unit of timeframes"""
+    if dt.tzinfo is None or dt.utcoffset() is None:
+        return (dt - _EPOCH) // _MICROSECOND
+    return (dt - _EPOCH_UTC) // _MICROSECOND
+
+
+def _is_aware(dt: datetime) -> bool:
+    """Whether `dt` is aware, by the same test as `_to_us`"""
+    return dt.tzinfo is not None and dt.utcoffset() is not None
+
+
+def _check_aware(aware: Optional[bool], other: Optional[bool]):
+    """Refuse to mix naive & aware, the same as comparing datetimes does
+
+    None stands for an empty batch, which goes along with either of them.
+    """
+    if aware is not None and other is not None and aware != other:
+        raise TypeError("can't compare offset-naive and offset-aware datetimes")
+
+
+def _check_all_aware(
+    time_frames: Iterable["BaseTimeFrame"], aware: Optional[bool] = None
+) -> Optional[bool]:
+    """`_check_aware` across many timeframes, handing out what they all are"""
+    kinds = {tf._aware for tf in time_frames}
+    kinds.discard(None)
+    if len(kinds) > 1:
+        _check_aware(False, True)
+    if kinds:
+        _check_aware(aware, *kinds)
+        return kinds.pop()
+    return aware
+
+
+def _datetime_of(us: int, tz: Optional[tzinfo] = None) -> datetime:
+    """The inverse of `_to_us`, handing out an aware datetime if `tz` is given"""
+    if tz is None:
+        return _EPOCH + timedelta(microseconds=us)
+    return (_EPOCH_UTC + timedelta(microseconds=us)).astimezone(tz)
+
+
+def _is_foreign(tf) -> bool:
+    """Whether `tf` is a timeframe implemented elsewhere, e.g. the numpy backend"""
+    return isinstance(tf, BaseTimeFrame) and not isinstance(
+        tf, (TimeFrame, BatchTimeFrame, _Empty)
+    )
+
 
 class BaseTimeFrame(metaclass=abc.ABCMeta):  # pragma: no cover
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def duration(self) -> float:
         pass
 
+    @property
+    @abc.abstractmethod
+    def duration_us(self) -> int:
+        pass
+
     @abc.abstractmethod
     def _has_common_ground(self, tf: "BaseTimeFrame") -> bool:
         pass
@@ -29,6 +125,10 @@ class BaseTimeFrame(metaclass=abc.ABCMeta):  # pragma: no cover
 
 
 class _Empty(BaseTimeFrame):
+    __slots__ = ()
+    # neither naive nor aware, see `_check_aware`
+    _aware = None
+
     def __repr__(self):
         return "Empty TimeFrame"
 
@@ -47,27 +147,516 @@ class _Empty(BaseTimeFrame):
     def duration(self) -> float:
         return 0.0
 
+    @property
+    def duration_us(self) -> int:
+        return 0
+
+
+class _MaxTree:
+    """A segment tree of the maximum over ranges of integers"""
+
+    __slots__ = ("_len", "_size", "_tree")
+
+    def __init__(self, values: List[int]):
+        size = 1
+        while size < len(values):
+            size *= 2
+        # -1 is lower than any gap, i.e. an empty leaf never matches
+        tree = [-1] * (2 * size)
+        tree[size : size + len(values)] = values
+        # one level at a time, the parents of [lower, upper) out of their children
+        lower, upper = size // 2, size
+        while lower:
+            tree[lower:upper] = map(
+                max,
+                tree[2 * lower : 2 * upper : 2],
+                tree[2 * lower + 1 : 2 * upper : 2],
+            )
+            lower, upper = lower // 2, lower
+        self._len, self._size, self._tree = len(values), size, tree
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def values(self) -> List[int]:
+        return self._tree[self._size : self._size + self._len]
+
+    def update(self, index: int, value: int):
+        tree = self._tree
+        node = index + self._size
+        tree[node] = value
+        while node > 1:
+            node //= 2
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+
+    def _nodes(self, lower: int, upper: int) -> List[int]:
+        """The nodes covering [lower, upper), from left to right"""
+        left, right = [], []
+        lower += self._size
+        upper += self._size
+        while lower < upper:
+            if lower & 1:
+                left.append(lower)
+                lower += 1
+            if upper & 1:
+                upper -= 1
+                right.append(upper)
+            lower //= 2
+            upper //= 2
+        return left + right[::-1]
+
+    def first(self, lower: int, upper: int, at_least: int) -> int:
+        """The first index within [lower, upper) with a value of `at_least`, or -1"""
+        tree = self._tree
+        for node in self._nodes(lower, upper):
+            if tree[node] >= at_least:
+                while node < self._size:
+                    node = 2 * node if tree[2 * node] >= at_least else 2 * node + 1
+                return node - self._size
+        return -1
+
+    def last(self, lower: int, upper: int, at_least: int) -> int:
+        """The last index within [lower, upper) with a value of `at_least`, or -1"""
+        tree = self._tree
+        for node in reversed(self._nodes(lower, upper)):
+            if tree[node] >= at_least:
+                while node < self._size:
+                    node = 2 * node + 1 if tree[2 * node + 1] >= at_least else 2 * node
+                return node - self._size
+        return -1
+
+
+class _SortedFrames:
+    """Sorted & disjoint timeframes, kept in chunks so that every edit stays local
+
+    A position is a `(chunk, offset)` pair, which is what `window` hands out and
+    what `splice` expects back.
+    """
+
+    __slots__ = ("_chunks", "_starts", "_mins", "_len", "_duration", "_gaps")
+
+    def __init__(self, time_frames: List["TimeFrame"]):
+        self._chunks = [
+            time_frames[index : index + _LOAD]
+            for index in range(0, len(time_frames), _LOAD)
+        ]
+        # the starts are cached per chunk to bisect them without a key function
+        self._starts = [[tf._start_us for tf in chunk] for chunk in self._chunks]
+        self._mins = [starts[0] for starts in self._starts]
+        self._len = len(time_frames)
+        # summed up on first use, then kept up to date by every splice
+        self._duration = None
+        # the longest gap per chunk, same as the duration
+        self._gaps = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    @staticmethod
+    def _total(time_frames: Iterable["TimeFrame"]) -> int:
+        return sum(tf._end_us - tf._start_us for tf in time_frames)
+
+    @property
+    def duration(self) -> int:
+        if self._duration is None:
+            self._duration = self._total(self)
+        return self._duration
+
+    @property
+    def first(self) -> Optional["TimeFrame"]:
+        return self._chunks[0][0] if self._chunks else None
+
+    @property
+    def last(self) -> Optional["TimeFrame"]:
+        return self._chunks[-1][-1] if self._chunks else None
+
+    def __iter__(self) -> Iterator["TimeFrame"]:
+        return chain.from_iterable(self._chunks)
+
+    def copy(self) -> "_SortedFrames":
+        frames = _SortedFrames.__new__(_SortedFrames)
+        frames._chunks = [list(chunk) for chunk in self._chunks]
+        frames._starts = [list(starts) for starts in self._starts]
+        frames._mins = list(self._mins)
+        frames._len = self._len
+        frames._duration = self._duration
+        # the tree is kept up to date in place, the copy builds its own
+        frames._gaps = None
+        return frames
+
+    @property
+    def gaps(self) -> _MaxTree:
+        """The longest gap after a timeframe of each chunk, see `gap`"""
+        if self._gaps is None:
+            self._gaps = _MaxTree(list(map(self._chunk_gap, range(len(self._chunks)))))
+        return self._gaps
+
+    def _chunk_gap(self, index: int) -> int:
+        """The longest gap in microseconds after a timeframe of a chunk, or -1
+
+        The last timeframe of a chunk is followed by the first one of the next.
+        """
+        nexts = self._starts[index][1:]
+        if index + 1 < len(self._chunks):
+            nexts.append(self._mins[index + 1])
+        return max(map(sub, nexts, map(_END_KEY, self._chunks[index])), default=1) - 2
+
+    def _refresh_gaps(self, index: int, untouched: int):
+        """Recompute the gaps from the chunk before `index` to the `untouched` last"""
+        gaps = self._gaps
+        lower, upper = max(index - 1, 0), len(self._chunks) - untouched
+        if len(gaps) == len(self._chunks):
+            for chunk in range(lower, upper):
+                gaps.update(chunk, self._chunk_gap(chunk))
+            return
+
+        # chunks were split or merged, only the leaves can be kept
+        values = gaps.values
+        values[lower : len(values) - untouched] = map(
+            self._chunk_gap, range(lower, upper)
+        )
+        self._gaps = _MaxTree(values)
+
+    def gap(
+        self,
+        lower: Tuple[int, int],
+        upper: Tuple[int, int],
+        at_least: int,
+        forward: bool,
+    ) -> Optional[Tuple["TimeFrame", "TimeFrame"]]:
+        """The timeframes on each side of the first gap of at least `at_least`
+
+        The gap is the one after a timeframe from position `lower` up to `upper`,
+        excluded, or the last of them if not `forward`. The chunks in between
+        are skipped through `gaps`, it's only the ones on the edge & the one
+        found that are scanned.
+        """
+        (lower_chunk, lower_offset), (upper_chunk, upper_offset) = lower, upper
+        if lower_chunk == upper_chunk:
+            return self._scan(
+                lower_chunk, lower_offset, upper_offset, at_least, forward
+            )
+
+        def inner():
+            find = self.gaps.first if forward else self.gaps.last
+            chunk = find(lower_chunk + 1, upper_chunk, at_least)
+            if chunk < 0:
+                return None
+            return self._scan(chunk, 0, len(self._chunks[chunk]), at_least, forward)
+
+        searches = (
+            lambda: self._scan(
+                lower_chunk,
+                lower_offset,
+                len(self._chunks[lower_chunk]),
+                at_least,
+                forward,
+            ),
+            inner,
+            lambda: self._scan(upper_chunk, 0, upper_offset, at_least, forward),
+        )
+        for search in searches if forward else searches[::-1]:
+            found = search()
+            if found is not None:
+                return found
+        return None
+
+    def _scan(
+        self, index: int, lower: int, upper: int, at_least: int, forward: bool
+    ) -> Optional[Tuple["TimeFrame", "TimeFrame"]]:
+        """`gap` over the timeframes of a single chunk, one at a time"""
+        chunk, starts = self._chunks[index], self._starts[index]
+        nexts = starts[lower + 1 : upper + 1]
+        if upper == len(chunk) and index + 1 < len(self._chunks):
+            nexts.append(self._mins[index + 1])
+        offsets = range(lower, lower + len(nexts))
+        for offset in offsets if forward else reversed(offsets):
+            if nexts[offset - lower] - chunk[offset]._end_us - 2 >= at_least:
+                if offset + 1 < len(chunk):
+                    return chunk[offset], chunk[offset + 1]
+                return chunk[offset], self._chunks[index + 1][0]
+        return None
+
+    def columns(self) -> Tuple[List[int], List[int]]:
+        """The starts & the ends of all the timeframes, as two flat lists"""
+        return list(chain.from_iterable(self._starts)), [tf._end_us for tf in self]
+
+    def chunk_columns(self, index: int) -> Tuple[List[int], List[int]]:
+        """The starts & the ends of the timeframes of a single chunk"""
+        return self._starts[index], [tf._end_us for tf in self._chunks[index]]
+
+    def offsets(self) -> List[int]:
+        """The index of the first timeframe of each chunk in the whole batch"""
+        return list(accumulate(map(len, self._chunks[:-1]), initial=0))
+
+    def locate(self, points: Iterable[int]) -> List[int]:
+        """The index of the timeframe containing each point, or -1 if none does"""
+        offsets = self.offsets()
+        result = []
+        for us in points:
+            chunk = bisect_right(self._mins, us) - 1
+            if chunk < 0:
+                result.append(-1)
+                continue
+            offset = bisect_right(self._starts[chunk], us) - 1
+            found = us <= self._chunks[chunk][offset]._end_us
+            result.append(offsets[chunk] + offset if found else -1)
+        return result
+
+    def _bisect(self, us: int) -> Tuple[int, int]:
+        """Return the position right after the last timeframe starting at `us`"""
+        chunk = bisect_right(self._mins, us) - 1
+        if chunk < 0:
+            return 0, 0
+        return chunk, bisect_right(self._starts[chunk], us)
+
+    def preceding(self, us: int, inclusive: bool = True) -> Optional["TimeFrame"]:
+        """Return the timeframe with the latest start before (or at) `us`"""
+        bisect = bisect_right if inclusive else bisect_left
+        chunk = bisect(self._mins, us) - 1
+        if chunk < 0:
+            return None
+        return self._chunks[chunk][bisect(self._starts[chunk], us) - 1]
+
+    def window(
+        self, start: int, end: int
+    ) -> Tuple[Tuple[int, int], Tuple[int, int], List["TimeFrame"]]:
+        """Return the range of timeframes that might overlap or touch start-end"""
+        chunk, offset = self._bisect(start)
+        lower = (chunk, max(offset - 1, 0))
+        upper = self._bisect(end)
+        return lower, upper, self._get(lower, upper)
+
+    def _get(self, lower: Tuple[int, int], upper: Tuple[int, int]) -> List["TimeFrame"]:
+        (lower_chunk, lower_offset), (upper_chunk, upper_offset) = lower, upper
+        if not self._chunks:
+            return []
+        if lower_chunk == upper_chunk:
+            return self._chunks[lower_chunk][lower_offset:upper_offset]
+
+        time_frames = self._chunks[lower_chunk][lower_offset:]
+        for chunk in self._chunks[lower_chunk + 1 : upper_chunk]:
+            time_frames.extend(chunk)
+        time_frames.extend(self._chunks[upper_chunk][:upper_offset])
+        return time_frames
+
+    def splice(
+        self,
+        lower: Tuple[int, int],
+        upper: Tuple[int, int],
+        time_frames: List["TimeFrame"],
+    ):
+        """Replace the timeframes between two positions with `time_frames`"""
+        if not self._chunks:
+            self.__init__(time_frames)
+            return
+
+        if self._duration is not None:
+            self._duration += self._total(time_frames)
+            self._duration -= self._total(self._get(lower, upper))
+
+        (lower_chunk, lower_offset), (upper_chunk, upper_offset) = lower, upper
+        chunks, starts, mins = self._chunks, self._starts, self._mins
+        starts_of = [tf._start_us for tf in time_frames]
+        # the chunks after the next one are left as they are, gaps included
+        untouched = max(len(chunks) - upper_chunk - 2, 0)
+
+        if lower_chunk == upper_chunk:
+            removed = upper_offset - lower_offset
+            chunks[lower_chunk][lower_offset:upper_offset] = time_frames
+            starts[lower_chunk][lower_offset:upper_offset] = starts_of
+        else:
+            removed = len(chunks[lower_chunk]) - lower_offset + upper_offset
+            removed += sum(map(len, chunks[lower_chunk + 1 : upper_chunk]))
+            del chunks[upper_chunk][:upper_offset]
+            del starts[upper_chunk][:upper_offset]
+            del chunks[lower_chunk + 1 : upper_chunk]
+            del starts[lower_chunk + 1 : upper_chunk]
+            del mins[lower_chunk + 1 : upper_chunk]
+            chunks[lower_chunk][lower_offset:] = time_frames
+            starts[lower_chunk][lower_offset:] = starts_of
+            if starts[lower_chunk + 1]:
+                mins[lower_chunk + 1] = starts[lower_chunk + 1][0]
+
+        self._len += len(time_frames) - removed
+        self._balance(lower_chunk)
+        if self._gaps is not None:
+            self._refresh_gaps(lower_chunk, untouched)
+
+    def _balance(self, index: int):
+        chunks, starts, mins = self._chunks, self._starts, self._mins
+
+        # merging small neighbours keeps the number of chunks proportional to n
+        if index + 1 < len(chunks) and (
+            len(chunks[index]) < _LOAD // 2 or len(chunks[index + 1]) < _LOAD // 2
+        ):
+            chunks[index].extend(chunks.pop(index + 1))
+            starts[index].extend(starts.pop(index + 1))
+            del mins[index + 1]
+
+        if not chunks[index]:
+            del chunks[index], starts[index], mins[index]
+        elif len(chunks[index]) > 2 * _LOAD:
+            chunk, chunk_starts = chunks[index], starts[index]
+            offsets = range(0, len(chunk), _LOAD)
+            chunks[index : index + 1] = [chunk[i : i + _LOAD] for i in offsets]
+            starts[index : index + 1] = [chunk_starts[i : i + _LOAD] for i in offsets]
+            mins[index : index + 1] = [chunk_starts[i] for i in offsets]
+        else:
+            mins[index] = starts[index][0]
+
 
 class BatchTimeFrame(BaseTimeFrame):
     def __init__(self, time_frames: Iterable[BaseTimeFrame]):
         if not isinstance(time_frames, Iterable):
             raise TypeError(f"{time_frames} should be an iterable")
 
+        # iterators can only be consumed once, the checks & the sort need a list
+        time_frames = list(time_frames)
         if not all(map(self._is_timeframe_or_empty, time_frames)):
             raise TypeError("Every iterable element should be a BaseTimeFrame")
 
-        self.time_frames = []
-        for assertion in sorted(
-            set(tf for tf in time_frames if isinstance(tf, TimeFrame))
-        ):
-            self._extend(assertion)
+        self._frames = _SortedFrames(
+            self._normalize([tf for tf in time_frames if isinstance(tf, TimeFrame)])
+        )
+
+    @classmethod
+    def _from_normalized(cls, time_frames: List["TimeFrame"]) -> "BatchTimeFrame":
+        """Wrap already sorted & disjoint timeframes, skipping normalization"""
+        btf = cls.__new__(cls)
+        btf._frames = _SortedFrames(time_frames)
+        return btf
+
+    @classmethod
+    def from_frames(
+        cls,
+        time_frames: Iterable[BaseTimeFrame],
+        backend: str = "python",
+        workers: Optional[int] = None,
+    ) -> BaseTimeFrame:
+        """Build a batch on the given backend, "auto" picks numpy if installed
+
+        With `workers`, the python backend sorts & merges on that many
+        processes, see `parallel.build`.
+        """
+        if backend not in _BACKENDS:
+            raise ValueError(f"backend should be one of {_BACKENDS}: {backend}")
+
+        if backend != "python":
+            from .array import ArrayBatchTimeFrame, np
+
+            if np is not None or backend == "numpy":
+                return ArrayBatchTimeFrame(time_frames)
+
+        if workers is not None:
+            from .parallel import build
+
+            return build(time_frames, workers)
+
+        return cls(time_frames)
+
+    @classmethod
+    def from_iterable(cls, time_frames: Iterable[BaseTimeFrame]) -> "BatchTimeFrame":
+        """Collect a one-pass iterable, coalescing on the fly while it's sorted
+
+        A stream sorted by start never holds more than the resulting timeframes
+        in memory; anything out of order is sorted out once it's exhausted.
+        """
+        if not isinstance(time_frames, Iterable):
+            raise TypeError(f"{time_frames} should be an iterable")
+
+        result = []
+        in_order = True
+        for tf in time_frames:
+            if not cls._is_timeframe_or_empty(tf):
+                raise TypeError("Every iterable element should be a BaseTimeFrame")
+            if isinstance(tf, _Empty):
+                continue
+            if result and tf._aware != result[0]._aware:
+                _check_aware(result[0]._aware, tf._aware)
+
+            if not result or not in_order:
+                result.append(tf)
+                continue
+
+            last = result[-1]
+            if tf._start_us < last._start_us:
+                in_order = False
+                result.append(tf)
+            elif tf._start_us <= last._end_us:
+                if tf._end_us > last._end_us:
+                    result[-1] = TimeFrame._span(last, tf)
+            else:
+                result.append(tf)
+
+        if not in_order:
+            result = cls._normalize(result)
+        return cls._from_normalized(result)
+
+    @classmethod
+    async def from_async_iter(
+        cls, time_frames: AsyncIterable[BaseTimeFrame]
+    ) -> "BatchTimeFrame":
+        """Collect an async iterable, merging as the timeframes arrive
+
+        See `aio.AsyncCoverageAggregator` to merge several sources at once.
+        """
+        from .aio import from_async_iter
+
+        return await from_async_iter(time_frames)
+
+    @classmethod
+    def union_all(cls, sources: Iterable[Iterable[BaseTimeFrame]]) -> "BatchTimeFrame":
+        """The union of many batches or sorted iterables, see `iter_union`"""
+        return cls._from_normalized(list(iter_union(sources)))
+
+    @classmethod
+    def intersect_all(
+        cls, sources: Iterable[Iterable[BaseTimeFrame]]
+    ) -> "BatchTimeFrame":
+        """The common time of many batches or sorted iterables, in a single sweep
+
+        See `iter_intersection`; it's multiplying them all together without any
+        of the intermediate batches, except that identical timeframes are in
+        common as a whole, where `*` sees no common ground in between them.
+        """
+        return cls._from_normalized(list(iter_intersection(sources)))
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike], mmap: bool = True) -> BaseTimeFrame:
+        """Read a file written by `save`; mapped, it's a read-only batch in place
+
+        See `storage.MappedBatchTimeFrame` for what the mapped batch offers.
+        """
+        from .storage import open_batch
+
+        return open_batch(path, mmap)
+
+    def save(self, path: Union[str, os.PathLike]):
+        """Write the batch to a compact binary file, see `open`"""
+        from .storage import save
+
+        save(self, path)
+
+    def copy(self) -> "BatchTimeFrame":
+        btf = type(self).__new__(type(self))
+        btf._frames = self._frames.copy()
+        return btf
 
     def __eq__(self, btf: "BatchTimeFrame") -> bool:
+        if _is_foreign(btf):
+            return NotImplemented
+
         if not isinstance(btf, BatchTimeFrame):
             raise TypeError(f"{btf} should be a BatchTimeFrame")
 
-        # the first condition is to short circuit and avoid wasting CPU cycles
-        return self.len_timeframes == btf.len_timeframes and all(
+        # the first conditions are to short circuit and avoid wasting CPU cycles
+        return (
+            self.len_timeframes == btf.len_timeframes
+            and self.start == btf.start
+            and self.end == btf.end
+        ) and all(
             current_timeframe == candidate
             for current_timeframe, candidate in zip(self, btf)
         )
@@ -77,31 +666,79 @@ class BatchTimeFrame(BaseTimeFrame):
         # nested batches is not allowed
         return isinstance(obj, (TimeFrame, _Empty))
 
-    def __iter__(self) -> Iterable["TimeFrame"]:
-        return iter(self.time_frames)
+    def __iter__(self) -> Iterator["TimeFrame"]:
+        return iter(self._frames)
+
+    @property
+    def time_frames(self) -> List["TimeFrame"]:
+        return list(self._frames)
 
     @property
     def len_timeframes(self):
-        return len(self.time_frames)
+        return len(self._frames)
 
     @property
     def duration(self) -> float:
-        return sum(time_frame.duration for time_frame in self)
-
-    def _extend(self, tf: "TimeFrame"):
-        # TODO: There might be a better solution to reduce the time complexity
-        for index, current_timeframe in enumerate(self):
-            if current_timeframe._has_common_ground(
-                tf
-            ) or current_timeframe._has_negligible_difference(tf):
-                last_tf = self.time_frames.pop(index)
-                # to avoid overlapped elements, every new extension should be
-                # compared to our current elements, so that we can reextend if
-                # possible
-                self._extend(last_tf + tf)
-                break
-        else:
-            self.time_frames.append(tf)
+        return self.duration_us / 1_000_000
+
+    @property
+    def duration_us(self) -> int:
+        """The exact duration in microseconds, free of float rounding"""
+        return self._frames.duration
+
+    @property
+    def start(self) -> Optional[datetime]:
+        """The earliest start, or None when the batch is empty"""
+        first = self._frames.first
+        return first.start if first is not None else None
+
+    @property
+    def end(self) -> Optional[datetime]:
+        """The latest end, or None when the batch is empty"""
+        last = self._frames.last
+        return last.end if last is not None else None
+
+    def _bounds_cover(self, start: int, end: int) -> bool:
+        """Whether start-end is within the bounds of the batch, an O(1) filter"""
+        frames = self._frames
+        return (
+            bool(frames)
+            and frames.first._start_us <= start
+            and end <= frames.last._end_us
+        )
+
+    @staticmethod
+    def _normalize(time_frames: List["TimeFrame"]) -> List["TimeFrame"]:
+        """Coalesce overlapping & adjacent timeframes with one sort & one sweep"""
+        if not time_frames:
+            return []
+
+        _count(len(time_frames) - 1)
+        # the sort would never get to compare naive & aware datetimes
+        _check_all_aware(time_frames)
+
+        result = []
+        frames = iter(sorted(time_frames, key=_SORT_KEY))
+        # `last` is the timeframe holding the latest end of the current run
+        head = last = next(frames)
+        end = head._end_us
+        for tf in frames:
+            # overlapping or with a negligible difference, i.e. `head + tf`
+            if tf._start_us <= end:
+                if tf._end_us > end:
+                    last, end = tf, tf._end_us
+                continue
+
+            result.append(head if last is head else TimeFrame._span(head, last))
+            head = last = tf
+            end = tf._end_us
+
+        result.append(head if last is head else TimeFrame._span(head, last))
+        return result
+
+    def _includes_timeframe(self, tf: "TimeFrame") -> bool:
+        candidate = self._frames.preceding(tf._start_us, inclusive=False)
+        return candidate is not None and tf._end_us < candidate._end_us
 
     def includes(self, tf: BaseTimeFrame) -> bool:
         warnings.warn(
@@ -112,114 +749,655 @@ class BatchTimeFrame(BaseTimeFrame):
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
+        _check_aware(self._aware, tf._aware)
         if isinstance(tf, BatchTimeFrame):
             # we should check if every element in `tf` is covered
-            for assertion in tf:
-                for current_timeframe in self:
-                    if current_timeframe.includes(assertion):
-                        break
-                else:
-                    return False
-            return True
+            return all(map(self._includes_timeframe, tf))
 
-        # isinstance(tf, BaseTimeFrame)
-        for current_timeframe in self:
-            if current_timeframe.includes(tf):
-                return True
+        if isinstance(tf, _Empty):
+            return False
 
-        return False
+        # isinstance(tf, TimeFrame)
+        return self._includes_timeframe(tf)
 
     def _has_common_ground(self, _: BaseTimeFrame) -> bool:  # pragma: no cover
         return False
 
+    @property
+    def _aware(self) -> Optional[bool]:
+        """Whether the timeframes are aware, or None if there's none"""
+        first = self._frames.first
+        return None if first is None else first._aware
+
+    def _overlapping(self, tf: "TimeFrame") -> List["TimeFrame"]:
+        """Return the timeframes that might overlap or touch `tf`"""
+        return self._frames.window(tf._start_us, tf._end_us)[2]
+
+    def add(self, tf: BaseTimeFrame):
+        """Merge `tf` in place, touching only the neighbours it overlaps with"""
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame) or _is_foreign(tf):
+            for candidate in tf.time_frames:
+                self.add(candidate)
+            return
+
+        if isinstance(tf, _Empty):
+            return
+
+        lower, upper, neighbours = self._frames.window(tf._start_us, tf._end_us)
+        result = []
+        if neighbours and neighbours[0]._end_us < tf._start_us:
+            result.append(neighbours.pop(0))  # it's only a preceding one
+
+        if neighbours:
+            first, last = neighbours[0], neighbours[-1]
+            tf = TimeFrame._span(
+                first if first._start_us < tf._start_us else tf,
+                last if last._end_us > tf._end_us else tf,
+            )
+        result.append(tf)
+
+        self._frames.splice(lower, upper, result)
+
+    def discard(self, tf: BaseTimeFrame):
+        """Remove `tf` in place, touching only the neighbours it overlaps with"""
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame) or _is_foreign(tf):
+            for candidate in tf.time_frames:
+                self.discard(candidate)
+            return
+
+        if isinstance(tf, _Empty):
+            return
+
+        lower, upper, neighbours = self._frames.window(tf._start_us, tf._end_us)
+        self._frames.splice(lower, upper, self._subtract(neighbours, [tf]))
+
+    def _prefers_incremental(self, btf: "BatchTimeFrame") -> bool:
+        # every incremental edit costs a few bisects plus a chunk-sized shift,
+        # so a linear rebuild wins once `btf` is no longer tiny compared to us
+        return btf.len_timeframes * 64 < self.len_timeframes
+
     def __add__(self, tf: BaseTimeFrame) -> "BatchTimeFrame":
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
-        if isinstance(tf, BatchTimeFrame):
-            candidates = list(tf)
+        if _is_foreign(tf):
+            return NotImplemented
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame) and not self._prefers_incremental(tf):
+            return BatchTimeFrame._from_normalized(
+                self._normalize(self.time_frames + tf.time_frames)
+            )
+
+        btf = self.copy()
+        btf.add(tf)
+        return btf
+
+    def __iadd__(self, tf: BaseTimeFrame) -> "BatchTimeFrame":
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        if _is_foreign(tf):
+            return NotImplemented
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame) and not self._prefers_incremental(tf):
+            self._frames = _SortedFrames(
+                self._normalize(self.time_frames + tf.time_frames)
+            )
         else:
-            candidates = [tf]
+            self.add(tf)
 
-        return BatchTimeFrame(list(self) + candidates)
+        return self
 
     def __mul__(self, tf: BaseTimeFrame) -> "BatchTimeFrame":
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
-        if not isinstance(tf, BatchTimeFrame):
-            candidate = [tf]
-        else:
-            candidate = tf
+        if _is_foreign(tf):
+            return NotImplemented
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame):
+            current, candidates = self.time_frames, tf.time_frames
+        elif isinstance(tf, TimeFrame):
+            current, candidates = self._overlapping(tf), [tf]
+        else:  # isinstance(tf, _Empty)
+            current, candidates = [], []
 
+        return BatchTimeFrame._from_normalized(self._intersect(current, candidates))
+
+    def __imul__(self, tf: BaseTimeFrame) -> "BatchTimeFrame":
+        if _is_foreign(tf):
+            return NotImplemented
+
+        # the overlap is rebuilt from scratch anyway, so there's no in-place gain
+        self._frames = (self * tf)._frames
+        return self
+
+    @staticmethod
+    def _intersect(
+        time_frames: List["TimeFrame"], candidates: List["TimeFrame"]
+    ) -> List["TimeFrame"]:
+        """Merge-join two sorted & disjoint lists, yielding a normalized overlap"""
         result = []
-        for timeframe in candidate:
-            for current_timeframe in self:
-                if timeframe._has_common_ground(current_timeframe):
-                    result.append(timeframe * current_timeframe)
-                    # TODO: should we break here?
-        return BatchTimeFrame(result)
+        i, j = 0, 0
+        while i < len(time_frames) and j < len(candidates):
+            current_timeframe, candidate = time_frames[i], candidates[j]
+            if current_timeframe._has_common_ground(candidate):
+                result.append(current_timeframe._overlap(candidate))
+
+            # whichever ends first cannot overlap with anything after the other
+            if current_timeframe._end_us < candidate._end_us:
+                i += 1
+            else:
+                j += 1
+
+        _count(i + j)
+        return result
 
     def __sub__(self, tf: BaseTimeFrame) -> "BatchTimeFrame":
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
-        if not isinstance(tf, BatchTimeFrame):
-            candidates = [tf]
+        if _is_foreign(tf):
+            return NotImplemented
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame) and not self._prefers_incremental(tf):
+            return BatchTimeFrame._from_normalized(
+                self._subtract(self.time_frames, tf.time_frames)
+            )
+
+        btf = self.copy()
+        btf.discard(tf)
+        return btf
+
+    def __isub__(self, tf: BaseTimeFrame) -> "BatchTimeFrame":
+        if not isinstance(tf, BaseTimeFrame):
+            raise TypeError(f"{tf} should be a BaseTimeFrame")
+
+        if _is_foreign(tf):
+            return NotImplemented
+
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame) and not self._prefers_incremental(tf):
+            self._frames = _SortedFrames(
+                self._subtract(self.time_frames, tf.time_frames)
+            )
         else:
-            candidates = tf
+            self.discard(tf)
 
-        result = list(self)
+        return self
 
-        for candidate in candidates:
-            for index, current_timeframe in enumerate(result):
-                if candidate._has_common_ground(current_timeframe):
-                    result[index] = current_timeframe - candidate
+    @staticmethod
+    def _subtract(
+        time_frames: List["TimeFrame"], candidates: List["TimeFrame"]
+    ) -> List["TimeFrame"]:
+        """Sweep the sorted & disjoint `candidates` out of `time_frames`
+
+        Every candidate is removed along with one microsecond on each side, the
+        same way `TimeFrame.__sub__` does it for a pair of timeframes.
+        """
+        result = []
+        compared = j = 0
+        for current_timeframe in time_frames:
+            start, end = current_timeframe._start_us, current_timeframe._end_us
+            # whatever ends before this one cannot reach any of the next ones
+            while j < len(candidates) and candidates[j]._end_us < start:
+                j += 1
+
+            # the remainder starts at `lower_us`, unless it's None
+            lower_us, tz = start, current_timeframe._tz
+            k = j - 1
+            for k in range(j, len(candidates)):
+                candidate = candidates[k]
+                if candidate._start_us > end:
+                    break
+
+                if candidate._start_us <= lower_us and end <= candidate._end_us:
+                    lower_us = None  # the remainder is completely covered
+                    break
+
+                if lower_us < candidate._start_us:
+                    if candidate._start_us >= end:
+                        continue  # touching on the edge is not an overlap
+                    result.append(
+                        TimeFrame._from_us(lower_us, candidate._start_us - 1, tz)
+                    )
+                    if candidate._end_us >= end:
+                        lower_us = None
+                        break
+                    lower_us = candidate._end_us + 1
+                elif lower_us < candidate._end_us or lower_us != start:
+                    # a single moment right where the remainder starts is only
+                    # on the edge if that's where the timeframe itself starts
+                    lower_us = candidate._end_us + 1
+
+            compared += k - j + 1
+            if lower_us is None:
+                continue
+            if lower_us == start:
+                result.append(current_timeframe)
+            else:
+                result.append(TimeFrame._from_us(lower_us, end, tz))
+
+        _count(compared + j)
+        return result
+
+    def find_slot(
+        self,
+        min_duration: timedelta,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        direction: str = "forward",
+    ) -> Optional["TimeFrame"]:
+        """The first gap lasting at least `min_duration`, or None if there's none
+
+        The gaps are the ones of `gaps(within=TimeFrame(after, before))`, with
+        the bounds defaulting to the span of the batch; "backward" hands out
+        the last one instead. The longest gap per chunk of the batch is kept in
+        a segment tree, built on the first query & kept up to date by every
+        change after it, so that only a chunk or two are ever scanned.
+        """
+        from .slots import find_slot
+
+        return find_slot(self, min_duration, after, before, direction)
+
+    def gaps(self, within: Optional["TimeFrame"] = None) -> "BatchTimeFrame":
+        """The time within the bounds not covered by any timeframe, `within - self`
+
+        The bounds default to the span of the batch, i.e. the gaps in between
+        its timeframes. Only the timeframes within the bounds are visited, so
+        it costs O(log n + k) for k of them.
+        """
+        if within is None:
+            if not self._frames:
+                return BatchTimeFrame([])
+            within = TimeFrame._span(self._frames.first, self._frames.last)
+
+        if isinstance(within, _Empty):
+            return BatchTimeFrame([])
+        if not isinstance(within, TimeFrame):
+            raise TypeError(f"{within} should be a TimeFrame")
+
+        _check_aware(self._aware, within._aware)
+        return BatchTimeFrame._from_normalized(
+            self._subtract([within], self._overlapping(within))
+        )
 
-        return BatchTimeFrame(result)
+    def complement(self, within: "TimeFrame") -> "BatchTimeFrame":
+        """The time within the bounds not covered by any timeframe, see `gaps`"""
+        return self.gaps(within)
+
+    def histogram(
+        self,
+        freq: timedelta,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[float]:
+        """The covered duration in seconds per bucket of `freq`, from start to end
+
+        The buckets are [start, start + freq), [start + freq, start + 2 * freq)
+        & so on, the last one cut short by `end`; the bounds default to the span
+        of the batch. It's one pass over the timeframes within the bounds & the
+        buckets, splitting the timeframes spanning several of them.
+        """
+        lower, upper, step = _buckets(self, freq, start, end)
+        totals = [0] * -(-(upper - lower) // step)
+        for tf in self._frames.window(lower, upper)[2]:
+            frame_start, frame_end = max(tf._start_us, lower), min(tf._end_us, upper)
+            index = (frame_start - lower) // step
+            while frame_start < frame_end:
+                edge = min(lower + (index + 1) * step, frame_end)
+                totals[index] += edge - frame_start
+                frame_start = edge
+                index += 1
+
+        return [total / 1_000_000 for total in totals]
 
     def __repr__(self) -> str:
         return "\n".join(str(tf) for tf in list(self))
 
+    def locate_many(self, dts: Iterable[datetime]) -> List[int]:
+        """The index of the timeframe containing each datetime, or -1 if none does
+
+        Each datetime is bisected into its chunk, then within it, so the batch is
+        never flattened. An array of `datetime64` (or of datetimes) gets a numpy
+        array back, with a `searchsorted` per chunk it hits.
+        """
+        if hasattr(dts, "__array__"):
+            from .array import _as_points, _locate_sorted
+
+            return _locate_sorted(self._frames, _as_points(dts, self._aware))
+
+        return self._frames.locate(_points(dts, self._aware))
+
+    def contains_many(self, dts: Iterable[datetime]) -> List[bool]:
+        """Whether each datetime is in the batch, i.e. `[dt in self for dt in dts]`"""
+        located = self.locate_many(dts)
+        if isinstance(located, list):
+            return [index >= 0 for index in located]
+        return located >= 0
+
     def __contains__(self, dt: Union[datetime, "BaseTimeFrame"]) -> bool:
         if not isinstance(dt, (datetime, BaseTimeFrame)):
             raise TypeError(f"{dt} should be either a datetime or a BaseTimeFrame")
 
         if isinstance(dt, datetime):
-            for current_timeframe in self:
-                if dt in current_timeframe:
-                    return True
-            return False
+            _check_aware(self._aware, _is_aware(dt))
+            us = _to_us(dt)
+            if not self._bounds_cover(us, us):
+                return False
+            return us <= self._frames.preceding(us)._end_us
 
         if isinstance(dt, _Empty):
             return True  # this is debatable & philosophical rather!
 
+        if _is_foreign(dt):
+            return all(map(self.__contains__, dt))
+
+        _check_aware(self._aware, dt._aware)
         if isinstance(dt, BatchTimeFrame):
+            if not dt._frames:
+                return True
+            if not self._bounds_cover(
+                dt._frames.first._start_us, dt._frames.last._end_us
+            ):
+                return False
             return all(map(self.__contains__, dt))
 
         # isinstance(dt, TimeFrame)
-        for current_timeframe in self:
-            if dt in current_timeframe:
-                return True
-        return False
+        if not self._bounds_cover(dt._start_us, dt._end_us):
+            return False
+        candidate = self._frames.preceding(dt._start_us)
+        return candidate is not None and dt._end_us <= candidate._end_us
+
+
+def _buckets(
+    tf: BaseTimeFrame,
+    freq: timedelta,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Tuple[int, int, int]:
+    """The bounds of a histogram & the width of its buckets, in microseconds"""
+    if not isinstance(freq, timedelta):
+        raise TypeError(f"{freq} should be a timedelta")
+    step = freq // _MICROSECOND
+    if step < 1:
+        raise ValueError(f"freq should be at least a microsecond: {freq}")
+    for bound in (start, end):
+        if bound is not None and not isinstance(bound, datetime):
+            raise TypeError(f"{bound} should be a datetime")
+        if bound is not None:
+            _check_aware(tf._aware, _is_aware(bound))
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"start should be lower or equal than end: {start} & {end}")
+
+    start = tf.start if start is None else start
+    end = tf.end if end is None else end
+    if start is None or end is None:
+        return 0, 0, step  # an empty batch with nothing else to go by
+    lower, upper = _to_us(start), _to_us(end)
+    # past the other bound, which defaults to the span, there's no bucket
+    return lower, max(lower, upper), step
+
+
+def _locate_many(
+    starts: Sequence[int],
+    ends: Sequence[int],
+    dts: Iterable[datetime],
+    aware: Optional[bool] = None,
+):
+    """`locate_many` over the columns of sorted & disjoint timeframes"""
+    if hasattr(dts, "__array__"):
+        from .array import _as_points, _locate, np
+
+        return _locate(
+            np.array(starts, np.int64),
+            np.array(ends, np.int64),
+            _as_points(dts, aware),
+        )
+
+    result = []
+    for us in _points(dts, aware):
+        index = bisect_right(starts, us) - 1
+        result.append(index if index >= 0 and us <= ends[index] else -1)
+    return result
+
+
+def _points(dts: Iterable[datetime], aware: Optional[bool] = None) -> Iterator[int]:
+    """Microseconds out of datetimes that are as aware as `aware`"""
+    for dt in dts:
+        if not isinstance(dt, datetime):
+            raise TypeError(f"{dt} should be a datetime")
+        _check_aware(aware, _is_aware(dt))
+        yield _to_us(dt)
+
+
+def normalize(time_frames: Iterable[BaseTimeFrame]) -> Iterator["TimeFrame"]:
+    """Coalesce a stream of timeframes sorted by start, lazily & in one pass
+
+    Only the timeframe being coalesced is held in memory, so the stream can be
+    unbounded. A timeframe starting before the previous one is a ValueError.
+    """
+    head = last = previous = None
+    end = None
+    for tf in time_frames:
+        if isinstance(tf, _Empty):
+            continue
+        if not isinstance(tf, TimeFrame):
+            raise TypeError(f"{tf} should be a TimeFrame")
+
+        if head is None:
+            head = last = previous = tf
+            end = tf._end_us
+            continue
+
+        if tf._aware != head._aware:
+            _check_aware(head._aware, tf._aware)
+        if tf._start_us < previous._start_us:
+            raise ValueError(f"timeframes should be sorted by start: {previous} & {tf}")
+        previous = tf
+
+        # overlapping or with a negligible difference, i.e. `head + tf`
+        if tf._start_us <= end:
+            if tf._end_us > end:
+                last, end = tf, tf._end_us
+            continue
+
+        yield head if last is head else TimeFrame._span(head, last)
+        head = last = tf
+        end = tf._end_us
+
+    if head is not None:
+        yield head if last is head else TimeFrame._span(head, last)
+
+
+def _checked(time_frames: Iterable[BaseTimeFrame]) -> Iterator["TimeFrame"]:
+    for tf in time_frames:
+        if isinstance(tf, TimeFrame):
+            yield tf
+        elif not isinstance(tf, _Empty):
+            raise TypeError(f"{tf} should be a TimeFrame")
+
+
+def _sorted_frames(source) -> Iterable["TimeFrame"]:
+    """The timeframes of a batch, a timeframe, or an iterable sorted by start"""
+    if isinstance(source, TimeFrame):
+        return [source]
+    if isinstance(source, _Empty):
+        return []
+    if isinstance(source, BaseTimeFrame):
+        return iter(source)  # batches only ever hold sorted timeframes
+    if isinstance(source, Iterable):
+        return _checked(source)
+    raise TypeError(f"{source} should be either a BaseTimeFrame or an iterable")
+
+
+def iter_union(sources: Iterable[Iterable[BaseTimeFrame]]) -> Iterator["TimeFrame"]:
+    """Lazily coalesce the union of many sources, each one sorted by start
+
+    The sources are merged with a heap, so the union of N timeframes across k
+    sources costs O(N log k), without building any intermediate batch.
+    """
+    streams = [_sorted_frames(source) for source in sources]
+    return normalize(heapq.merge(*streams, key=_START_KEY))
+
+
+def _cursor(source) -> Generator[Optional["TimeFrame"], int, None]:
+    """Hand out the timeframes of a source, sorted & disjoint, skipping ahead
+
+    Sent a moment, it hands out the next timeframe ending at or after it;
+    through a batch, it leaps over the ones in between with a bisect. None
+    means the source is exhausted.
+    """
+    if isinstance(source, BatchTimeFrame):
+        frames = source._frames
+        chunks = frames._chunks
+        chunk = offset = 0
+        while chunk < len(chunks):
+            lower = yield chunks[chunk][offset]
+            offset += 1
+            if offset == len(chunks[chunk]):
+                chunk, offset = chunk + 1, 0
+            if chunk == len(chunks) or chunks[chunk][offset]._end_us >= lower:
+                continue
+
+            # the last one starting at or before `lower` might still reach it
+            chunk, offset = frames._bisect(lower)
+            if chunks[chunk][offset - 1]._end_us >= lower:
+                offset -= 1
+            elif offset == len(chunks[chunk]):
+                chunk, offset = chunk + 1, 0
+    else:
+        if isinstance(source, BaseTimeFrame):
+            time_frames = iter(_sorted_frames(source))  # normalized already
+        else:
+            time_frames = normalize(_sorted_frames(source))
+        lower = None
+        for tf in time_frames:
+            if lower is None or tf._end_us >= lower:
+                lower = yield tf
+
+    yield None
+
+
+def iter_intersection(
+    sources: Iterable[Iterable[BaseTimeFrame]],
+) -> Iterator["TimeFrame"]:
+    """Lazily sweep the common time of many sources, each one sorted by start
+
+    The source whose current timeframe ends first is moved on, past whatever
+    ends before the latest start; a heap of the current ends picks it, so N
+    timeframes across k sources cost O(N log k) at worst. The sweep stops as
+    soon as any source runs out. Touching on the edge is not an overlap, the
+    same as for `__mul__`.
+    """
+    cursors = [_cursor(source) for source in sources]
+    if not cursors:
+        raise ValueError("sources should hold at least one source")
+
+    current = []
+    for cursor in cursors:
+        tf = next(cursor)
+        if tf is None:
+            return  # nothing in common with an empty source
+        current.append(tf)
+    # every source is checked on its own, it's only left to check them together
+    _check_all_aware(current)
+
+    ends = [(tf._end_us, index) for index, tf in enumerate(current)]
+    heapq.heapify(ends)
+    # the starts of each source only grow, and so does the latest one of them
+    head = max(current, key=_START_KEY)
+    while True:
+        end, index = ends[0]
+        if head._start_us < end or (
+            # a single moment, in common unless it's only where two of them touch
+            head._start_us == end
+            and all(
+                tf._start_us < end < tf._end_us or not tf.duration_us for tf in current
+            )
+        ):
+            yield TimeFrame._span(head, current[index])
+
+        # whichever ends first cannot overlap with anything after the others
+        _count(1)
+        tf = cursors[index].send(head._start_us)
+        if tf is None:
+            return
+        current[index] = tf
+        heapq.heapreplace(ends, (tf._end_us, index))
+        if tf._start_us > head._start_us:
+            head = tf
 
 
 # it might be a good idea to use this across the whole project
 class TimeFrame(BaseTimeFrame):
+    # millions of these are kept in memory, a `__dict__` for each is a waste,
+    # and so are the datetimes, they're built out of the microseconds on demand
+    __slots__ = ("_start_us", "_end_us", "_tz")
+
     def __init__(self, start_datetime: datetime, end_datetime: datetime):
         if not isinstance(start_datetime, datetime):
             raise TypeError("start_datetime has to be a datetime")
         if not isinstance(end_datetime, datetime):
             raise TypeError("end_datetime has to be a datetime")
 
-        if start_datetime > end_datetime:
+        aware = _is_aware(start_datetime)
+        _check_aware(aware, _is_aware(end_datetime))
+
+        # every comparison happens on these, the datetimes are only handed out
+        start_us, end_us = _to_us(start_datetime), _to_us(end_datetime)
+        if start_us > end_us:
             raise ValueError(
                 f"start should be lower or equal than end: {start_datetime}"
                 f" & {end_datetime}"
             )
 
-        self.start = start_datetime
-        self.end = end_datetime
+        self._start_us = start_us
+        self._end_us = end_us
+        # both ends are handed out in the timezone of the start
+        self._tz = start_datetime.tzinfo if aware else None
+
+    @classmethod
+    def _from_us(cls, start: int, end: int, tz: Optional[tzinfo] = None) -> "TimeFrame":
+        """Build a timeframe from microseconds that are known to be ordered"""
+        tf = object.__new__(cls)
+        tf._start_us, tf._end_us, tf._tz = start, end, tz
+        return tf
+
+    @classmethod
+    def _span(cls, head: "TimeFrame", tail: "TimeFrame") -> "TimeFrame":
+        """From the start of `head` to the end of `tail`, trusting they're ordered"""
+        tf = object.__new__(cls)
+        tf._start_us, tf._end_us, tf._tz = head._start_us, tail._end_us, head._tz
+        return tf
+
+    @property
+    def start(self) -> datetime:
+        return _datetime_of(self._start_us, self._tz)
+
+    @property
+    def end(self) -> datetime:
+        return _datetime_of(self._end_us, self._tz)
+
+    @property
+    def _aware(self) -> bool:
+        return self._tz is not None
+
+    def __reduce__(self):
+        # the microseconds are all there is to it, no datetime is pickled
+        return TimeFrame._from_us, (self._start_us, self._end_us, self._tz)
 
     def includes(self, dt: Union[datetime, BaseTimeFrame]) -> bool:
         warnings.warn(
@@ -231,68 +1409,122 @@ class TimeFrame(BaseTimeFrame):
             raise TypeError(f"{dt} should be either a datetime or a BaseTimeFrame")
 
         if isinstance(dt, datetime):
-            return self.start <= dt <= self.end
+            _check_aware(self._aware, _is_aware(dt))
+            return self._start_us <= _to_us(dt) <= self._end_us
 
+        _check_aware(self._aware, dt._aware)
         if isinstance(dt, BatchTimeFrame):
-            # the list should contain at least one element
-            return all(map(self.includes, dt)) if list(dt) else False
+            # the batch should contain at least one element
+            return (
+                bool(dt._frames)
+                and self._start_us < dt._frames.first._start_us
+                and dt._frames.last._end_us < self._end_us
+            )
 
         if isinstance(dt, _Empty):
             return False
 
-        return self.start < dt.start <= dt.end < self.end
+        return self._start_us < dt._start_us <= dt._end_us < self._end_us
 
     @property
     def duration(self) -> float:
-        return (self.end - self.start).total_seconds()
+        """The seconds elapsed from start to end, see `duration_us`"""
+        return self.duration_us / 1_000_000
+
+    @property
+    def duration_us(self) -> int:
+        """The exact duration in microseconds, free of float rounding
+
+        It's the time that elapses, so a daylight saving change in between two
+        aware datetimes counts, unlike subtracting them in the same timezone.
+        """
+        return self._end_us - self._start_us
 
     def __gt__(self, tf: BaseTimeFrame) -> bool:
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
+        if _is_foreign(tf):
+            return NotImplemented
+
         if isinstance(tf, _Empty):
             # this is debatable
             return False
 
+        _check_aware(self._aware, tf._aware)
         if isinstance(tf, BatchTimeFrame):
-            return all(map(self.__gt__, tf))
+            # being greater than the latest end is being greater than them all
+            return not tf._frames or self._start_us > tf._frames.last._end_us
 
-        return self.start > tf.end
+        return self._start_us > tf._end_us
 
     def __ge__(self, tf: BaseTimeFrame) -> bool:
+        if _is_foreign(tf):
+            return NotImplemented
+
         if isinstance(tf, _Empty):
             return False
 
         if isinstance(tf, BatchTimeFrame):
-            return all(map(self.__ge__, tf))
+            # `self >= x` boils down to `self.end >= x.start`, so the latest
+            # start of the batch is the only one that matters
+            _check_aware(self._aware, tf._aware)
+            last = tf._frames.last
+            return last is None or self._end_us >= last._start_us
 
-        return self.__gt__(tf) or self.end >= tf.start
+        return self.__gt__(tf) or self._end_us >= tf._start_us
 
     def __eq__(self, tf: BaseTimeFrame) -> bool:
+        # the most common case goes first, skipping the isinstance checks
+        if tf.__class__ is TimeFrame:
+            return (
+                self._start_us == tf._start_us
+                and self._end_us == tf._end_us
+                and self._aware == tf._aware  # naive & aware are never equal
+            )
+
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
+        if _is_foreign(tf):
+            return NotImplemented
+
         if isinstance(tf, _Empty):
             return False
 
         if isinstance(tf, BatchTimeFrame):
-            return all(map(self.__eq__, tf))
+            # normalized timeframes are distinct, so at most one can be equal
+            return tf.len_timeframes == 0 or (
+                tf.len_timeframes == 1 and self.__eq__(tf._frames.first)
+            )
 
-        return self.start == tf.start and self.end == tf.end
+        return (
+            self._start_us == tf._start_us
+            and self._end_us == tf._end_us
+            and self._aware == tf._aware
+        )
 
     def _has_common_ground(self, tf: BaseTimeFrame) -> bool:
         if isinstance(tf, _Empty):
             return False
 
+        start, end = self._start_us, self._end_us
         return (
-            self.start < tf.start < self.end
-            or self.start < tf.end < self.end
-            or tf.start < self.start < tf.end
-            or tf.start < self.end < tf.end
+            start < tf._start_us < end
+            or start < tf._end_us < end
+            or tf._start_us < start < tf._end_us
+            or tf._start_us < end < tf._end_us
         )
 
     def _has_negligible_difference(self, tf: "TimeFrame") -> bool:
-        return self.start == tf.end or self.end == tf.start
+        return self._start_us == tf._end_us or self._end_us == tf._start_us
+
+    def _overlap(self, tf: "TimeFrame") -> "TimeFrame":
+        """The overlap of two timeframes, given that they have common ground"""
+        return TimeFrame._span(
+            self if self._start_us >= tf._start_us else tf,
+            self if self._end_us <= tf._end_us else tf,
+        )
 
     def __mul__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
         """Return the common slots (overlap) of two or more timeframes"""
@@ -300,16 +1532,15 @@ class TimeFrame(BaseTimeFrame):
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
+        _check_aware(self._aware, tf._aware)
         if isinstance(tf, TimeFrame):
             if not self._has_common_ground(tf):
                 return _Empty()
 
-            start = max(self.start, tf.start)
-            end = min(self.end, tf.end)
-            return TimeFrame(start, end)
+            return self._overlap(tf)
 
         # isinstance(tf, BatchTimeFrame)
-        return BatchTimeFrame(list(map(self.__mul__, tf)))
+        return tf * self
 
     def __add__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
         """Return the summation of two timeframes"""
@@ -317,6 +1548,10 @@ class TimeFrame(BaseTimeFrame):
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be a BaseTimeFrame")
 
+        if _is_foreign(tf):
+            return NotImplemented
+
+        _check_aware(self._aware, tf._aware)
         if isinstance(tf, BatchTimeFrame):
             return tf + self
 
@@ -324,14 +1559,15 @@ class TimeFrame(BaseTimeFrame):
             return self
 
         if self._has_common_ground(tf):
-            start = min(self.start, tf.start)
-            end = max(self.end, tf.end)
-            return TimeFrame(start, end)
+            return TimeFrame._span(
+                self if self._start_us <= tf._start_us else tf,
+                self if self._end_us >= tf._end_us else tf,
+            )
 
         if self._has_negligible_difference(tf):
-            if self.end == tf.start:
-                return TimeFrame(self.start, tf.end)
-            return TimeFrame(tf.start, self.end)
+            if self._end_us == tf._start_us:
+                return TimeFrame._span(self, tf)
+            return TimeFrame._span(tf, self)
 
         return BatchTimeFrame([self, tf])
 
@@ -342,51 +1578,52 @@ class TimeFrame(BaseTimeFrame):
             raise TypeError(f"{dt} should be either a datetime or a BaseTimeFrame")
 
         if isinstance(dt, datetime):
-            return self.start <= dt <= self.end
+            _check_aware(self._aware, _is_aware(dt))
+            return self._start_us <= _to_us(dt) <= self._end_us
 
         if isinstance(dt, _Empty):
             return True  # this is debatable & philosophical rather!
 
-        if isinstance(dt, BatchTimeFrame):
+        if _is_foreign(dt):
             return all(map(self.__contains__, dt))
 
-        return self.start <= dt.start <= dt.end <= self.end
+        _check_aware(self._aware, dt._aware)
+        if isinstance(dt, BatchTimeFrame):
+            # the bounds of the batch are enough to tell
+            return not dt._frames or (
+                self._start_us <= dt._frames.first._start_us
+                and dt._frames.last._end_us <= self._end_us
+            )
+
+        return self._start_us <= dt._start_us <= dt._end_us <= self._end_us
 
     def __sub__(self, tf: BaseTimeFrame) -> BaseTimeFrame:
         """Remove the portion of the time specified in tf"""
         if not isinstance(tf, BaseTimeFrame):
             raise TypeError(f"{tf} should be either a BaseTimeFrame")
 
-        if isinstance(tf, BatchTimeFrame):
-            return reduce(TimeFrame.__sub__, tf, self)
+        if _is_foreign(tf):
+            return NotImplemented
 
         if isinstance(tf, _Empty):
             return self
-        elif self in tf:
-            return _Empty()
-        elif self.includes(tf):
-            first_upper = tf.start - timedelta(microseconds=1)
-            second_lower = tf.end + timedelta(microseconds=1)
-            return BatchTimeFrame(
-                [
-                    TimeFrame(self.start, first_upper),
-                    TimeFrame(second_lower, self.end),
-                ],
-            )
-        elif not self._has_common_ground(tf):
-            return self
-        else:  # self._has_common_ground(tf)
-            if self.start < tf.start < self.end:
-                lower = self.start
-                upper = tf.start - timedelta(microseconds=1)
-            else:
-                lower = tf.end + timedelta(microseconds=1)
-                upper = self.end
 
-            return TimeFrame(lower, upper)
+        _check_aware(self._aware, tf._aware)
+        if isinstance(tf, BatchTimeFrame):
+            candidates = tf._overlapping(self)
+        else:
+            candidates = [tf]
+
+        remainders = BatchTimeFrame._subtract([self], candidates)
+        if not remainders:
+            return _Empty()
+        if len(remainders) == 1:
+            return remainders[0]
+        return BatchTimeFrame._from_normalized(remainders)
 
     def __repr__(self) -> str:
         return f"{self.start.isoformat()}#{self.end.isoformat()}"
 
     def __hash__(self) -> int:
-        return hash(self.__repr__())
+        # two integers hash faster than a cached hash would cost in memory
+        return hash((self._start_us, self._end_us))